@@ -27,6 +27,7 @@ from uuid import uuid4
 import dash
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
+import plotly.io
 from dash.dependencies import (ALL, MATCH, ClientsideFunction, Input, Output,
                                State)
 from dash.exceptions import PreventUpdate
@@ -47,6 +48,8 @@ from generators import (heatmap_generator, histogram_generator,
 app = dash.Dash(
     name="VIRUS-MVP",
     title="VIRUS-MVP",
+    # Do not flash "Updating..." in the tab title while callbacks run
+    update_title=None,
     assets_folder=ASSETS_DIR,
     # We bring in jQuery for some of the JavaScript
     # callbacks.
@@ -156,7 +159,7 @@ def launch_app(_):
         # Bootstrap row containing toasts
         toast_generator.get_toast_row(),
         # Bootstrap row containing heatmap
-        heatmap_generator.get_heatmap_row(data_),
+        read_heatmap_row(get_data_args, last_data_mtime),
         # Bootstrap row containing histogram
         histogram_generator.get_histogram_row(data_),
         # Bootstrap row containing table
@@ -189,6 +192,9 @@ def launch_app(_):
         dcc.Store(id="strain-to-del"),
         dcc.Store(id="deleted-strain"),
         dcc.Store(id="positions-jumped-to"),
+        # Heatmap cells fig serialized as a JSON string, parsed into the
+        # fig clientside.
+        dcc.Store(id="heatmap-cells-fig-json"),
         # TODO starting gene should be part of a config file
         dcc.Store(id="default-starting-gene", data="S"),
         # Used to update certain figures only when necessary
@@ -335,6 +341,115 @@ def read_data(get_data_args, last_data_mtime):
     return ret
 
 
+@cache.memoize(timeout=TIMEOUT)
+def read_heatmap_fig(fig_name, get_data_args, last_data_mtime):
+    """Returns and caches a heatmap fig generated from ``read_data``.
+
+    Heatmap figs only change when the ``get_data`` return value
+    changes, but several callbacks regenerate them. So we cache them
+    with the same key as ``read_data``. We cache the figs as dicts,
+    which are faster to load from the cache than Plotly figure objects,
+    and which Dash accepts as figures.
+
+    :param fig_name: Name of ``heatmap_generator`` fn that returns the
+        fig, e.g., "get_heatmap_gene_bar_fig".
+    :type fig_name: str
+    :param get_data_args: Args for ``get_data``
+    :type get_data_args: dict
+    :param last_data_mtime: Last mtime across all data files
+    :type last_data_mtime: float
+    :return: Heatmap fig as a dict
+    :rtype: dict
+    """
+    data = read_data(get_data_args, last_data_mtime)
+    ret = getattr(heatmap_generator, fig_name)(data).to_dict()
+    return ret
+
+
+@cache.memoize(timeout=TIMEOUT)
+def read_heatmap_row(get_data_args, last_data_mtime):
+    """Returns and caches the heatmap row served by ``launch_app``.
+
+    Every page load calls ``launch_app``, which would otherwise rebuild
+    all the heatmap figs, even if the data has not changed. So we cache
+    the row with the same key as ``read_data``.
+
+    :param get_data_args: Args for ``get_data``
+    :type get_data_args: dict
+    :param last_data_mtime: Last mtime across all data files
+    :type last_data_mtime: float
+    :return: Heatmap row
+    :rtype: html.Div
+    """
+    data = read_data(get_data_args, last_data_mtime)
+    ret = heatmap_generator.get_heatmap_row(data)
+    return ret
+
+
+@cache.memoize(timeout=TIMEOUT)
+def read_histogram_top_row(get_data_args, last_data_mtime):
+    """Returns and caches the top row of the histogram view.
+
+    The histogram only depends on the ``get_data`` return value, so we
+    cache it with the same key as ``read_data``. This means the
+    histogram callback does not have to load the entire ``get_data``
+    return value from the cache when the data has not changed.
+
+    :param get_data_args: Args for ``get_data``
+    :type get_data_args: dict
+    :param last_data_mtime: Last mtime across all data files
+    :type last_data_mtime: float
+    :return: Top row in the histogram view
+    :rtype: list[dbc.Col]
+    """
+    data = read_data(get_data_args, last_data_mtime)
+    ret = histogram_generator.get_histogram_top_row(data)
+    return ret
+
+
+@cache.memoize(timeout=TIMEOUT)
+def read_select_lineages_modal_body(get_data_args, last_data_mtime):
+    """Returns and caches the select lineages modal body.
+
+    The modal body only depends on the ``get_data`` return value, so we
+    cache it with the same key as ``read_data``. Uploads and deletions
+    change ``last_data_mtime``, so they never reuse a stale body.
+
+    :param get_data_args: Args for ``get_data``
+    :type get_data_args: dict
+    :param last_data_mtime: Last mtime across all data files
+    :type last_data_mtime: float
+    :return: Content representing the select lineages modal body
+    :rtype: list
+    """
+    data = read_data(get_data_args, last_data_mtime)
+    ret = toolbar_generator.get_select_lineages_modal_body(data)
+    return ret
+
+
+@cache.memoize(timeout=TIMEOUT)
+def read_heatmap_cells_fig_json(get_data_args, last_data_mtime):
+    """Returns and caches the heatmap cells fig as a JSON string.
+
+    The cells fig is by far the largest heatmap fig. Dash would
+    otherwise walk the entire fig dict with its JSON encoder on every
+    response. Instead, we serialize it once here--using orjson if it is
+    installed--and Dash only has to send a string, which is parsed
+    into the fig clientside.
+
+    :param get_data_args: Args for ``get_data``
+    :type get_data_args: dict
+    :param last_data_mtime: Last mtime across all data files
+    :type last_data_mtime: float
+    :return: Heatmap cells fig as a JSON string
+    :rtype: str
+    """
+    data = read_data(get_data_args, last_data_mtime)
+    ret = plotly.io.to_json(heatmap_generator.get_heatmap_cells_fig(data),
+                            validate=False)
+    return ret
+
+
 @app.callback(
     Output("show-clade-defining", "data"),
     Input("clade-defining-mutations-switch", "value"),
@@ -608,8 +723,7 @@ def update_select_lineages_modal_body(get_data_args, last_data_mtime):
     :return: Content representing the select lineages modal body
     :rtype: list[dbc.FormGroup]
     """
-    data = read_data(get_data_args, last_data_mtime)
-    return toolbar_generator.get_select_lineages_modal_body(data)
+    return read_select_lineages_modal_body(get_data_args, last_data_mtime)
 
 
 @app.callback(
@@ -935,14 +1049,14 @@ def route_data_heatmap_y_strains_update(get_data_args, old_heatmap_y_strains,
     Output("heatmap-strains-axis-outer-container", "style"),
     Input("heatmap-y-strains", "data"),
     State("get-data-args", "data"),
-    State("last-data-mtime", "data"),
-    prevent_initial_call=True
+    State("last-data-mtime", "data")
 )
 def update_heatmap_strains_axis_fig(_, get_data_args, last_data_mtime):
     """Update heatmap strains axis fig and containers.
 
     We need to update style because attributes may change due to
-    uploaded strains.
+    uploaded strains. This is also called once after the app is
+    launched, because the fig is empty in ``get_heatmap_row``.
 
     :param _: Heatmap strains updated
     :param get_data_args: Args for ``get_data``
@@ -950,12 +1064,13 @@ def update_heatmap_strains_axis_fig(_, get_data_args, last_data_mtime):
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
     :return: New heatmap strains axis fig and style
-    :rtype: (plotly.graph_objects.Figure, dict)
+    :rtype: (dict, dict)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    strain_axis_fig = heatmap_generator.get_heatmap_strains_axis_fig(data)
+    strain_axis_fig = read_heatmap_fig("get_heatmap_strains_axis_fig",
+                                       get_data_args, last_data_mtime)
     strain_axis_style = \
         {"height": data["heatmap_cells_fig_height"],
          "width": "101%",
@@ -983,14 +1098,14 @@ def update_heatmap_strains_axis_fig(_, get_data_args, last_data_mtime):
     Output("heatmap-sample-size-axis-outer-container", "style"),
     Input("heatmap-y-strains", "data"),
     State("get-data-args", "data"),
-    State("last-data-mtime", "data"),
-    prevent_initial_call=True
+    State("last-data-mtime", "data")
 )
 def update_heatmap_sample_size_axis_fig(_, get_data_args, last_data_mtime):
     """Update heatmap sample size axis fig and containers.
 
     We need to update style because attributes may change due to
-    uploaded strains.
+    uploaded strains. This is also called once after the app is
+    launched, because the fig is empty in ``get_heatmap_row``.
 
     :param _: Heatmap strains updated
     :param get_data_args: Args for ``get_data``
@@ -998,13 +1113,13 @@ def update_heatmap_sample_size_axis_fig(_, get_data_args, last_data_mtime):
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
     :return: New heatmap sample size axis fig and style
-    :rtype: (plotly.graph_objects.Figure, dict)
+    :rtype: (dict, dict)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    sample_size_axis_fig = \
-        heatmap_generator.get_heatmap_sample_size_axis_fig(data)
+    sample_size_axis_fig = read_heatmap_fig(
+        "get_heatmap_sample_size_axis_fig", get_data_args, last_data_mtime)
     sample_size_axis_style = \
         {"height": data["heatmap_cells_fig_height"],
          "width": "101%",
@@ -1045,12 +1160,13 @@ def update_heatmap_gene_bar_fig(_, get_data_args, last_data_mtime):
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
     :return: New heatmap gene bar fig and style
-    :rtype: (plotly.graph_objects.Figure, dict)
+    :rtype: (dict, dict)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    gene_bar_fig = heatmap_generator.get_heatmap_gene_bar_fig(data)
+    gene_bar_fig = read_heatmap_fig("get_heatmap_gene_bar_fig",
+                                    get_data_args, last_data_mtime)
     gene_bar_style = {"width": data["heatmap_cells_fig_width"]}
     return gene_bar_fig, gene_bar_style
 
@@ -1072,12 +1188,13 @@ def update_heatmap_nsp_bar_fig(_, get_data_args, last_data_mtime):
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
     :return: New heatmap gene bar fig and style
-    :rtype: (plotly.graph_objects.Figure, dict)
+    :rtype: (dict, dict)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    nsp_bar_fig = heatmap_generator.get_heatmap_nsp_bar_fig(data)
+    nsp_bar_fig = read_heatmap_fig("get_heatmap_nsp_bar_fig",
+                                   get_data_args, last_data_mtime)
     nsp_bar_style = {"width": data["heatmap_cells_fig_width"]}
     return nsp_bar_fig, nsp_bar_style
 
@@ -1102,12 +1219,13 @@ def update_heatmap_nt_pos_axis_fig(_, get_data_args, last_data_mtime):
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
     :return: New heatmap nt pos x-axis fig and style
-    :rtype: (plotly.graph_objects.Figure, dict)
+    :rtype: (dict, dict)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    nt_pos_x_axis_fig = heatmap_generator.get_heatmap_nt_pos_axis_fig(data)
+    nt_pos_x_axis_fig = read_heatmap_fig("get_heatmap_nt_pos_axis_fig",
+                                         get_data_args, last_data_mtime)
     nt_pos_x_axis_style = {"width": data["heatmap_cells_fig_width"]}
     return nt_pos_x_axis_fig, nt_pos_x_axis_style
 
@@ -1132,12 +1250,13 @@ def update_heatmap_aa_pos_axis_fig(_, get_data_args, last_data_mtime):
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
     :return: New heatmap amino acid position x-axis fig and style
-    :rtype: (plotly.graph_objects.Figure, dict)
+    :rtype: (dict, dict)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    aa_pos_x_axis_fig = heatmap_generator.get_heatmap_aa_pos_axis_fig(data)
+    aa_pos_x_axis_fig = read_heatmap_fig("get_heatmap_aa_pos_axis_fig",
+                                         get_data_args, last_data_mtime)
     aa_pos_x_axis_style = {"width": data["heatmap_cells_fig_width"]}
     return aa_pos_x_axis_fig, aa_pos_x_axis_style
 
@@ -1162,12 +1281,11 @@ def update_histogram(get_data_args, last_data_mtime):
     :return: New histogram figure corresponding to new data
     :rtype: plotly.graph_objects.Figure
     """
-    data = read_data(get_data_args, last_data_mtime)
-    return histogram_generator.get_histogram_top_row(data)
+    return read_histogram_top_row(get_data_args, last_data_mtime)
 
 
 @app.callback(
-    Output("heatmap-cells-fig", "figure"),
+    Output("heatmap-cells-fig-json", "data"),
     Output("heatmap-cells-fig", "style"),
     Output("heatmap-cells-inner-container", "style"),
     Output("heatmap-cells-outer-container", "style"),
@@ -1182,6 +1300,9 @@ def update_heatmap_cells_fig(get_data_args, last_data_mtime):
     This is the fig with the heatmap cells and x axis. We return style
     because attributes may need to change due to changes in data.
 
+    The fig itself is returned as a JSON string, which is parsed into
+    the fig by a clientside callback.
+
     We also update ``data-loading``. We keep the value as ``None``,
     but returning it in this fn provides a spinner while this fn is
     being run.
@@ -1190,14 +1311,15 @@ def update_heatmap_cells_fig(get_data_args, last_data_mtime):
     :type get_data_args: dict
     :param last_data_mtime: Last mtime across all data files
     :type last_data_mtime: float
-    :return: New heatmap cells fig, associated styles, and
+    :return: New heatmap cells fig JSON, associated styles, and
         ``data-loading`` children.
-    :rtype: Tuple(plotly.graph_objects.Figure, dict, dict, dict, None)
+    :rtype: Tuple(str, dict, dict, dict, None)
     """
     # Current ``get_data`` return val
     data = read_data(get_data_args, last_data_mtime)
 
-    cells_fig = heatmap_generator.get_heatmap_cells_fig(data)
+    cells_fig_json = read_heatmap_cells_fig_json(get_data_args,
+                                                 last_data_mtime)
     cells_fig_style = {
         "height": data["heatmap_cells_fig_height"],
         "width": data["heatmap_cells_fig_width"],
@@ -1222,7 +1344,7 @@ def update_heatmap_cells_fig(get_data_args, last_data_mtime):
         "width": data["heatmap_cells_fig_width"],
         "overflow": "hidden"
     }
-    return (cells_fig, cells_fig_style, inner_container_style,
+    return (cells_fig_json, cells_fig_style, inner_container_style,
             outer_container_style, None)
 
 
@@ -1312,13 +1434,15 @@ def toggle_mutation_details_modal(click_data, _, get_data_args,
         open or closed, mutation details modal header, and mutation
         details body.
     :rtype: (bool, str, dbc.ListGroup)"""
-    # Current ``get_data`` return val
-    data = read_data(get_data_args, last_data_mtime)
-
     ctx = dash.callback_context
     triggered_prop_id = ctx.triggered[0]["prop_id"]
     # We only open the modal when the heatmap is clicked
     if triggered_prop_id == "last-heatmap-cell-clicked.data":
+        # Current ``get_data`` return val. Only read when opening the
+        # modal, so closing it does not have to load ``data`` from the
+        # cache.
+        data = read_data(get_data_args, last_data_mtime)
+
         x = click_data["points"][0]["x"]
         y = click_data["points"][0]["y"]
         mutation_name = data["heatmap_mutation_names"][y][x]
@@ -1473,6 +1597,15 @@ app.clientside_callback(
     State("data", "data"),
     prevent_initial_call=True
 )
+app.clientside_callback(
+    ClientsideFunction(
+        namespace="clientside",
+        function_name="parseHeatmapCellsFigJson"
+    ),
+    Output("heatmap-cells-fig", "figure"),
+    Input("heatmap-cells-fig-json", "data"),
+    prevent_initial_call=True
+)
 app.clientside_callback(
     ClientsideFunction(
         namespace="clientside",
@@ -320,6 +320,15 @@ window.dash_clientside = Object.assign({}, window.dash_clientside, {
         }
         isSyncingRightScroll = false;
       }
+    },
+    /**
+     * Parse the heatmap cells fig JSON string serialized and cached by the
+     * server, so Dash does not have to walk the fig dict on every response.
+     * @param {String} figJson Heatmap cells fig as a JSON string.
+     * @return {Object} Heatmap cells fig.
+     */
+    parseHeatmapCellsFigJson: (figJson) => {
+      return JSON.parse(figJson)
     }
   }
 });
@@ -381,8 +381,8 @@ def get_data(dirs, show_clade_defining=False, hidden_strains=None,
             get_heatmap_z(visible_parsed_mutations,
                           intra_col_mutation_pos_dict,
                           sample_sizes),
-        "heatmap_hover_text":
-            get_heatmap_hover_text(visible_parsed_mutations,
+        "heatmap_hover_data":
+            get_heatmap_hover_data(visible_parsed_mutations,
                                    intra_col_mutation_pos_dict),
         "heatmap_mutation_names":
             get_heatmap_mutation_names(visible_parsed_mutations,
@@ -401,6 +401,12 @@ def get_data(dirs, show_clade_defining=False, hidden_strains=None,
         get_heatmap_x_tickvals(ret["heatmap_cells_tickvals"])
     ret["heatmap_x_aa_pos"] = \
         get_heatmap_x_aa_pos(ret["heatmap_x_nt_pos"], ret["heatmap_x_genes"])
+    ret["heatmap_y_strains_tick_text"] = \
+        get_heatmap_y_strains_tick_text(ret["heatmap_y_strains"],
+                                        voc_strains,
+                                        voi_strains,
+                                        circulating_strains,
+                                        variants_dict)
     ret["heatmap_cells_fig_height"] = \
         max(10*40, len(ret["heatmap_y_strains"]) * 40)
     ret["heatmap_cells_container_height"] = \
@@ -616,6 +622,49 @@ def get_heatmap_y_strains(parsed_mutations):
     return ret
 
 
+def get_heatmap_y_strains_tick_text(heatmap_y_strains, voc_strains,
+                                    voi_strains, circulating_strains,
+                                    variants_dict):
+    """Get tick text of heatmap strain y axis.
+
+    VOC strains are bolded, VOI strains are italicized, strains with a
+    variant name are suffixed with it, and actively circulating strains
+    are marked with a warning sign.
+
+    :param heatmap_y_strains: ``get_heatmap_y_strains`` return value
+    :type heatmap_y_strains: list[str]
+    :param voc_strains: Dict with VOC strains as keys
+    :type voc_strains: dict
+    :param voi_strains: Dict with VOI strains as keys
+    :type voi_strains: dict
+    :param circulating_strains: Dict with actively circulating strains
+        as keys.
+    :type circulating_strains: dict
+    :param variants_dict: Variant names of strains, or "n/a"
+    :type variants_dict: dict
+    :return: List of D3 formatted tick text values for each strain in
+        ``heatmap_y_strains``.
+    :rtype: list[str]
+    """
+    ret = []
+    for strain in heatmap_y_strains:
+        if strain in voc_strains:
+            strain_text = ["<b>", strain, "</b>"]
+        elif strain in voi_strains:
+            strain_text = ["<i>", strain, "</i>"]
+        else:
+            strain_text = [strain]
+
+        if variants_dict[strain] != "n/a":
+            strain_text += [" (", variants_dict[strain], ")"]
+
+        if strain in circulating_strains:
+            strain_text.append("⚠️")
+
+        ret.append("".join(strain_text))
+    return ret
+
+
 def get_heatmap_y_sample_sizes(parsed_mutations, sample_sizes):
     """Get sample size y axis values of heatmap cells.
 
@@ -673,8 +722,11 @@ def get_heatmap_z(parsed_mutations, intra_col_mutation_pos_dict, sample_sizes):
     return ret
 
 
-def get_heatmap_hover_text(parsed_mutations, intra_col_mutation_pos_dict):
-    """Get hover text of heatmap cells.
+def get_heatmap_hover_data(parsed_mutations, intra_col_mutation_pos_dict):
+    """Get values displayed in the hover text of heatmap cells.
+
+    The hover text template itself is in the heatmap generator, so we
+    only send the values that differ between cells to the browser.
 
     :param parsed_mutations: A dictionary containing multiple merged
         ``get_parsed_gvf_dir`` return "mutations" values.
@@ -682,9 +734,11 @@ def get_heatmap_hover_text(parsed_mutations, intra_col_mutation_pos_dict):
     :param intra_col_mutation_pos_dict: See
         ``get_intra_col_mutation_pos_dict`` return value.
     :type intra_col_mutation_pos_dict: dict
-    :return: List of D3 formatted text values for each x y coordinate
-        in ``heatmap_x_nt_pos``.
-    :rtype: list[list[str]]
+    :return: List of hover text values--mutation name, multiple AA
+        mutations, reference, alternate, alternate frequency, and
+        functions--for each x y coordinate in ``heatmap_x_nt_pos``.
+        ``None`` for coordinates without a mutation.
+    :rtype: list[list[list[str]]]
     """
     ret = []
     for strain in parsed_mutations:
@@ -711,21 +765,12 @@ def get_heatmap_hover_text(parsed_mutations, intra_col_mutation_pos_dict):
                     if not functions_str:
                         functions_str = "None recorded so far"
 
-                    cell_text_str = "<b>Mutation name:</b> %s<br>" \
-                                    "Multiple AA mutations?: %s<br>" \
-                                    "<br>" \
-                                    "Reference: %s<br>" \
-                                    "Alternate: %s<br>" \
-                                    "Alternate frequency: %s<br>" \
-                                    "<br>" \
-                                    "<b>Functions:</b> <br>%s"
-                    cell_text_params = (mutation_name,
-                                        multi_aa_name,
-                                        mutation["ref"],
-                                        mutation["alt"],
-                                        mutation["alt_freq"],
-                                        functions_str)
-                    cols[col] = cell_text_str % cell_text_params
+                    cols[col] = [str(mutation_name),
+                                 str(multi_aa_name),
+                                 str(mutation["ref"]),
+                                 str(mutation["alt"]),
+                                 str(mutation["alt_freq"]),
+                                 functions_str]
             row.extend(cols)
         ret.append(row)
     return ret
@@ -21,9 +21,11 @@ To also output tsvs of the unmatched mutation names:
 import argparse
 import pandas as pd
 import re
-import glob
 import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
 from cyvcf2 import VCF, Writer
 
 
@@ -44,11 +46,20 @@ def parse_args():
     parser.add_argument('--outdir', type=str, default='./gvf_files/',
                         help='Output directory for finished GVF files: folder will be created if it doesn\'t already exist')
     parser.add_argument("--names", help="Save unmatched mutation names to .tsvs for troubleshooting naming formats", action="store_true")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of VCF files to process in parallel (default: number of CPUs)')
     return parser.parse_args()
 
 
 gvf_columns = ['#seqid','#source','#type','#start','#end','#score','#strand','#phase','#attributes']
 vcf_colnames = ['#CHROM', 'POS', 'ID', 'REF', 'ALT', 'QUAL', 'FILTER', 'INFO', 'FORMAT', 'unknown']
+pragmas = ['##gff-version 3', '##gvf-version 1.10', '##species NCBI_Taxonomy_URI=http://www.ncbi.nlm.nih.gov/Taxonomy/Browser/wwwtax.cgi?id=2697049']
+
+#patterns used for every file, compiled once
+eff_info_pattern = re.compile(r'\((.*?)\)') #everything between parentheses
+mutation_name_pattern = re.compile(r'Name=(?:p\.)?(?P<mutation>[^;]*)') #hgvs protein name, without the prefix
+strain_name_pattern = re.compile(r'(.*)_ids.*') #strain name in vcf file names
+quote_space_table = str.maketrans('', '', "' ") #deletes quotes and spaces with str.translate
 
 def vcftogvf(var_data, strain):
      
@@ -59,7 +70,7 @@ def vcftogvf(var_data, strain):
     new_df = pd.DataFrame(index=range(0,len(df)),columns=gvf_columns)
 
     #parse EFF column
-    eff_info = df['INFO'].str.findall('\((.*?)\)') #series: extract everything between parentheses as elements of a list
+    eff_info = df['INFO'].str.findall(eff_info_pattern) #series: extract everything between parentheses as elements of a list
     eff_info = eff_info.apply(pd.Series)[0] #take first element of list
     eff_info = eff_info.str.split(pat='|').apply(pd.Series) #split at pipe, form dataframe
 
@@ -122,80 +133,72 @@ def vcftogvf(var_data, strain):
 
 
 
-#takes 3 arguments: an output file of vcftogvf.py, Anoosha's annotation file from Pokay, and the clade defining mutations tsv.
-def add_functions(gvf, annotation_file, clade_file, strain):
+#load Anoosha's annotation file from Pokay, skipping leading whitespace in every field while parsing.
+#this is done once, and the result, indexed by mutation for joining, shared across all vcf files.
+def load_annotation(annotation_file):
+    df = pd.read_csv(annotation_file, sep='\t', header=0, dtype=str, skipinitialspace=True,
+                     usecols=['mutation', 'function_category', 'source', 'citation', 'comb_mutation', 'function_description']) #load functional annotations spreadsheet
+    return df.set_index('mutation')
+
+
+#load the clade defining mutations tsv; this is done once, and the result shared across all vcf files.
+def load_clades(clade_file):
+    return pd.read_csv(clade_file, sep='\t', header=0, dtype=str, usecols=['strain', 'mutation']) #load clade-defining mutations file
+
+
+#takes 3 arguments: an output file of vcftogvf.py, the load_annotation() dataframe, and the load_clades() dataframe.
+#if names is True, also return the unmatched mutation names for troubleshooting.
+def add_functions(gvf, annotation_df, clades_df, strain, names=False):
 
-    #load files into Pandas dataframes
-    df = pd.read_csv(annotation_file, sep='\t', header=0) #load functional annotations spreadsheet
-    clades = pd.read_csv(clade_file, sep='\t', header=0, usecols=['strain', 'mutation']) #load clade-defining mutations file
-    clades = clades.loc[clades.strain == strain] #only look at the relevant part of that file
+    clades = clades_df.loc[clades_df.strain == strain] #only look at the relevant part of that file
     
-    attributes = gvf["#attributes"].str.split(pat=';').apply(pd.Series)
-    hgvs_protein = attributes[0].str.split(pat='=').apply(pd.Series)[1]
-    hgvs_nucleotide = attributes[1].str.split(pat='=').apply(pd.Series)[1]
-    gvf["mutation"] = hgvs_protein.str[2:] #drop the prefix
-
-    #merge annotated vcf and functional annotation files by 'mutation' column in the gvf
-    for column in df.columns:
-        df[column] = df[column].str.lstrip()
-    merged_df = pd.merge(df, gvf, on=['mutation'], how='right') #add functional annotations
+    gvf["mutation"] = gvf["#attributes"].str.extract(mutation_name_pattern, expand=False) #hgvs protein name, without the prefix
+
+    #join functional annotations onto the gvf by its 'mutation' column
+    #the annotation index is shared across calls, so its hash table is only built once
+    merged_df = gvf.join(annotation_df, on='mutation', how='left', sort=False) #add functional annotations
+    #share one set of categories between the clade merge keys, so the merge joins on integer codes
+    #(assign() leaves the shared clade dataframe untouched)
+    mutation_categories = pd.Index(pd.concat([merged_df['mutation'], clades['mutation']]).dropna().unique())
+    merged_df = merged_df.assign(mutation=pd.Categorical(merged_df['mutation'], categories=mutation_categories))
+    clades = clades.assign(mutation=pd.Categorical(clades['mutation'], categories=mutation_categories))
     merged_df = pd.merge(clades, merged_df, on=['mutation'], how='right') #add clade-defining mutations
 
-    #collect all mutation groups (including reference mutation) in a column, sorted alphabetically
-    #this is more roundabout than it needs to be; streamline with grouby() later
-    merged_df["mutation_group"] = merged_df["comb_mutation"].astype(str) + ", '" + merged_df["mutation"].astype(str) + "'"
-    mutation_groups = merged_df["mutation_group"].str.split(pat=',').apply(pd.Series)
-    mutation_groups = mutation_groups.apply(lambda s:s.str.replace("'", ""))
-    mutation_groups = mutation_groups.apply(lambda s:s.str.replace(" ", ""))
-    mutation_groups = mutation_groups.transpose() 
-    sorted_df = mutation_groups
-    for column in mutation_groups.columns:
-        sorted_df[column] = mutation_groups.sort_values(by=column, ignore_index=True)[column]
-    sorted_df = sorted_df.transpose()
+    #collect all mutation groups (including reference mutation) as lists, sorted alphabetically
+    comb_mutations = merged_df["comb_mutation"].fillna('').str.translate(quote_space_table).str.split(pat=',') #strip quotes and spaces in one pass
+    mutation_groups = [sorted(x for x in comb + [mutation] if (x==x and x)) for comb, mutation in zip(comb_mutations, merged_df["mutation"])] #remove nan and '' from groups
     
-    #since they're sorted, put everything back into a single cell, don't care about dropna
-    df3 = sorted_df.apply(lambda x :','.join(x.astype(str)),axis=1)
-    unique_groups = df3.drop_duplicates() 
-    unique_groups_multicol = sorted_df.drop_duplicates() 
-    merged_df["mutation_group_labeller"] = df3 #for sanity checking
+    #since they're sorted, put everything back into a single cell
+    merged_df["mutation_group_labeller"] = [','.join(group) for group in mutation_groups] #for sanity checking
     
     #make a unique id for mutation groups that have all members represented in the vcf
     #for groups with missing members, delete those functional annotations
-    merged_df["id"] = 'NaN'
-    id_num = 0
-    for row in range(unique_groups.shape[0]):
-        group_mutation_set = set(unique_groups_multicol.iloc[row])
-        group_mutation_set = {x for x in group_mutation_set if (x==x and x!='nan')} #remove nan and 'nan' from set
-        gvf_all_mutations = set(gvf['mutation'].unique())
-        indices = merged_df[merged_df.mutation_group_labeller == unique_groups.iloc[row]].index.tolist()
-        if group_mutation_set.issubset(gvf_all_mutations): #if all mutations in the group are in the vcf file, include those rows and give them an id
-            merged_df.loc[merged_df.mutation_group_labeller == unique_groups.iloc[row], "id"] = "ID_" + str(id_num)
-            id_num += 1
-        else:
-            merged_df = merged_df.drop(indices) #if not, drop group rows, leaving the remaining indices unchanged
+    #members of all groups are integer-coded in one flat array, and the missing members counted per row
+    group_sizes = [len(group) for group in mutation_groups]
+    member_codes, members = pd.factorize(np.array(list(chain.from_iterable(mutation_groups)), dtype=object))
+    gvf_all_mutations = gvf['mutation'].unique() #also reused for the unmatched names below
+    member_missing = ~pd.Index(members).isin(gvf_all_mutations)
+    row_of_member = np.repeat(np.arange(len(mutation_groups)), group_sizes)
+    missing_counts = np.bincount(row_of_member, weights=member_missing[member_codes], minlength=len(mutation_groups))
+    merged_df = merged_df[missing_counts == 0] #drop incomplete group rows, leaving the remaining indices unchanged
+    group_ids = pd.factorize(merged_df["mutation_group_labeller"])[0] #numbered in order of first appearance
+    merged_df = merged_df.assign(id=["ID_" + str(x) for x in group_ids])
 
     #change semicolons in function descriptions to colons
-    merged_df['function_description'] = merged_df['function_description'].str.replace(';',':')
-    #add key-value pairs to attributes column
-    for column in ['function_category', 'source', 'citation', 'comb_mutation', 'function_description']:
-        key = column.lower()
-        merged_df[column] = merged_df[column].fillna('') #replace NaNs with empty string
-        if column in ['function_category', 'citation', 'function_description']:
-            merged_df["#attributes"] = merged_df["#attributes"].astype(str) + key + '=' + '"' + merged_df[column].astype(str) + '"' + ';'
-        else:
-            merged_df["#attributes"] = merged_df["#attributes"].astype(str) + key + '=' + merged_df[column].astype(str) + ';'
-
-    #change clade-defining attribute to True/False depending on content of 'strain' column
-    merged_df.loc[merged_df.strain == strain, "#attributes"] = merged_df.loc[merged_df.strain == strain, "#attributes"].astype(str)  + "clade_defining=True;"
-    merged_df.loc[merged_df.strain != strain, "#attributes"] = merged_df.loc[merged_df.strain != strain, "#attributes"].astype(str)  + "clade_defining=False;"
-
-    #add ID to attributes
-    merged_df["#attributes"] = 'ID=' + merged_df['id'].astype(str) + ';' + merged_df["#attributes"].astype(str)
+    merged_df['function_description'] = merged_df['function_description'].str.replace(';', ':', regex=False)
+    #add key-value pairs, the clade-defining attribute and the ID to the attributes column in one pass
+    annotation_columns = ['function_category', 'source', 'citation', 'comb_mutation', 'function_description']
+    merged_df[annotation_columns] = merged_df[annotation_columns].fillna('') #replace NaNs with empty string
+    clade_defining = merged_df.strain == strain #True/False depending on content of 'strain' column
+    merged_df["#attributes"] = [
+        f'ID={id_};{attributes}function_category="{category}";source={source};citation="{citation}";comb_mutation={comb};function_description="{description}";clade_defining={is_clade_defining};'
+        for id_, attributes, category, source, citation, comb, description, is_clade_defining
+        in zip(merged_df['id'], merged_df["#attributes"], *(merged_df[column] for column in annotation_columns), clade_defining)]
     
-    if args.names:
+    if names:
         #get list of names in tsv but not in functional annotations, and vice versa, saved as a .tsv
-        tsv_names = gvf["mutation"].unique()
-        pokay_names = df["mutation"].unique()
+        tsv_names = gvf_all_mutations
+        pokay_names = annotation_df.index.unique().to_numpy()
         print(str(np.setdiff1d(tsv_names, pokay_names).shape[0]) + "/" + str(tsv_names.shape[0]) + " mutation names were not found in pokay")
         in_pokay_only = pd.DataFrame({'in_pokay_only':np.setdiff1d(pokay_names, tsv_names)})
         in_tsv_only = pd.DataFrame({'in_tsv_only':np.setdiff1d(tsv_names, pokay_names)})
@@ -214,6 +217,38 @@ def add_functions(gvf, annotation_file, clade_file, strain):
     
       
 
+#convert one annotated vcf file to an annotated gvf file, saved in outdir.
+#kept at module level, with no reliance on globals, so it can be run in worker processes.
+def process_vcf(file, strain, annotation_df, clades_df, outdir, names=False):
+    #create gvf from annotated vcf (ignoring pragmas for now)
+    gvf = vcftogvf(file, strain)
+    #add functional annotations
+    if names:
+        annotated_gvf, leftover_names, mutations, leftover_clade_names = add_functions(gvf, annotation_df, clades_df, strain, names=True)
+    else:
+        annotated_gvf = add_functions(gvf, annotation_df, clades_df, strain)
+        leftover_names, mutations, leftover_clade_names = None, None, None
+    #write pragmas, then the gvf (with column names) to the same .gvf file
+    filepath = os.path.join(outdir, strain + ".annotated.gvf")
+    with open(filepath, 'w', newline='') as f:
+        f.write('\n'.join(pragmas) + '\n')
+        annotated_gvf.to_csv(f, sep='\t', index=False, chunksize=50000) #write in bounded chunks of rows
+
+    return filepath, leftover_names, mutations, leftover_clade_names
+
+
+#annotation and clade dataframes shared by all files handled in a worker process, set once by init_worker
+worker_frames = {}
+
+def init_worker(annotation_df, clades_df):
+    worker_frames['annotation_df'] = annotation_df
+    worker_frames['clades_df'] = clades_df
+
+#process_vcf, using the dataframes sent to this worker process when it started, instead of pickling them for every file
+def process_vcf_in_worker(file, strain, outdir, names=False):
+    return process_vcf(file, strain, worker_frames['annotation_df'], worker_frames['clades_df'], outdir, names)
+
+
 if __name__ == '__main__':
     
     args = parse_args()
@@ -229,8 +264,9 @@ if __name__ == '__main__':
     all_strains_mutations = []
     leftover_df = pd.DataFrame() #empty dataframe to hold unmatched names
     unmatched_clade_names = pd.DataFrame() #empty dataframe to hold unmatched clade-defining mutation names
-    pragmas = pd.DataFrame([['##gff-version 3'], ['##gvf-version 1.10'], ['##species NCBI_Taxonomy_URI=http://www.ncbi.nlm.nih.gov/Taxonomy/Browser/wwwtax.cgi?id=2697049']]) #pragmas are in column 0
 
+    files = []
+    strains = []
     
     if args.vcfdir:
         if not os.path.exists(args.vcfdir):
@@ -239,85 +275,59 @@ if __name__ == '__main__':
             print("Processing vcf files in " + args.vcfdir + " ...")
             print("")
     
+            with os.scandir(args.vcfdir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.vcf'): #get all .vcf files
+                        #get strain name from the file name
+                        match = strain_name_pattern.search(entry.name)
+                        files.append(entry.path)
+                        strains.append(match.group(1))
+            
+            
+    if args.vcffile:
+        
+        file = args.vcffile
+            
+        #get strain name from the file name
+        match = strain_name_pattern.search(os.path.basename(file))
+        strain = match.group(1)
+        files.append(file)
+        strains.append(strain)
+        
 
-        for file in glob.glob(args.vcfdir + '/*.vcf'): #get all .vcf files
+    #each file is written to its own output path, so process them in parallel
+    annotation_df = load_annotation(annotation_file)
+    clades_df = load_clades(clade_file)
+    convert = partial(process_vcf_in_worker, outdir=outdir, names=args.names)
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(annotation_df, clades_df)) as executor:
+        results = executor.map(convert, files, strains)
+        for file, strain, (filepath, leftover_names, mutations, leftover_clade_names) in zip(files, strains, results):
             print("Processing: " + file)
-            
-            #get strain name
-            pat = r'.*?' + args.vcfdir + '(.*)_ids.*'
-            match = re.search(pat, file)
-            strain = match.group(1)
             print("Strain: ", strain)
-            
-            #create gvf from annotated vcf (ignoring pragmas for now)
-            gvf = vcftogvf(file, strain)
-            #add functional annotations
-            if args.names:
-                annotated_gvf, leftover_names, mutations, leftover_clade_names = add_functions(gvf, annotation_file, clade_file, strain)
-            else:
-                annotated_gvf = add_functions(gvf, annotation_file, clade_file, strain)
-            #add pragmas to df, then save to .gvf
-            annotated_gvf = pd.DataFrame(np.vstack([annotated_gvf.columns, annotated_gvf])) #columns are now 0, 1, ...
-            final_gvf = pragmas.append(annotated_gvf)
-            filepath = outdir + strain + ".annotated.gvf"
             print("Saved as: ", filepath)
             print("")
-            final_gvf.to_csv(filepath, sep='\t', index=False, header=False)
             
             if args.names:        
                 all_strains_mutations.append(mutations)
                 leftover_df = leftover_df.append(leftover_names)
                 unmatched_clade_names = unmatched_clade_names.append(leftover_clade_names)
-            
-            
-    if args.vcffile:
-        
-        file = args.vcffile
-        
-        print("Processing: " + file)
-            
-        #get strain name
-        pat = r'.*?' + '(.*)_ids.*'
-        match = re.search(pat, file.split("/")[-1])
-        strain = match.group(1)
-        print("Strain: ", strain)
-        
-        #create gvf from annotated vcf (ignoring pragmas for now)
-        gvf = vcftogvf(file, strain)
-        #add functional annotations
-        if args.names:
-            annotated_gvf, leftover_names, mutations, leftover_clade_names = add_functions(gvf, annotation_file, clade_file, strain)
-        else:
-            annotated_gvf = add_functions(gvf, annotation_file, clade_file, strain)
-        #add pragmas to df, then save to .gvf
-        annotated_gvf = pd.DataFrame(np.vstack([annotated_gvf.columns, annotated_gvf])) #columns are now 0, 1, ...
-        final_gvf = pragmas.append(annotated_gvf)
-        filepath = outdir + strain + ".annotated.gvf"
-        print("Saved as: ", filepath)
-        print("")
-        final_gvf.to_csv(filepath, sep='\t', index=False, header=False)
-        
-        if args.names:        
-            all_strains_mutations.append(mutations)
-            leftover_df = leftover_df.append(leftover_names)
-            unmatched_clade_names = unmatched_clade_names.append(leftover_clade_names)
         
             
     if args.names:  
         #save unmatched names (in tsv but not in Pokay) across all strains to a .tsv file
         if args.vcffile:
-            leftover_names_filepath = outdir + strain + "_leftover_names.tsv"
+            leftover_names_filepath = os.path.join(outdir, strain + "_leftover_names.tsv")
         if args.vcfdir:
-            leftover_names_filepath = outdir + "leftover_names.tsv"
+            leftover_names_filepath = os.path.join(outdir, "leftover_names.tsv")
         leftover_df.to_csv(leftover_names_filepath, sep='\t', index=False)
         print("")
         print("Mutation names not found in Pokay saved to " + leftover_names_filepath)
     
         #save unmatched clade-defining mutation names across all strains to a .tsv file
         if args.vcffile:
-            leftover_clade_names_filepath = outdir + strain + "_leftover_clade_defining_names.tsv"
+            leftover_clade_names_filepath = os.path.join(outdir, strain + "_leftover_clade_defining_names.tsv")
         if args.vcfdir:
-            leftover_clade_names_filepath = outdir + "all_leftover_clade_defining_names.tsv"
+            leftover_clade_names_filepath = os.path.join(outdir, "all_leftover_clade_defining_names.tsv")
         unmatched_clade_names.to_csv(leftover_clade_names_filepath, sep='\t', index=False)
         print("Clade-defining mutation names not found in the annotated VCFs saved to " + leftover_clade_names_filepath)
 
@@ -3,6 +3,22 @@
 import dash_bootstrap_components as dbc
 import dash_html_components as html
 
+ALL_LABS = [
+    "Saskatchewan - Roy Romanow Provincial Laboratory(RRPL)",
+    "Nova Scotia Health Authority",
+    "Alberta ProvLab North(APLN)",
+    "Queen's University / Kingston Health Sciences Centre",
+    "National Microbiology Laboratory(NML)",
+    "BCCDC Public Health Laboratory",
+    "Public Health Ontario(PHO)",
+    "Newfoundland and Labrador - Eastern Health",
+    "Unity Health Toronto",
+    "Ontario Institute for Cancer Research(OICR)",
+    "Manitoba Cadham Provincial Laboratory"
+]
+# Labs above as an Oxford comma separated list, for the acknowledgement
+ALL_LABS_STR = ", ".join(ALL_LABS[:-1]) + ", and " + ALL_LABS[-1]
+
 
 def get_footer_row_div(cidgoh_logo_path):
     """Get Dash Bootstrap Components row containing footer view.
@@ -13,20 +29,6 @@ def get_footer_row_div(cidgoh_logo_path):
     :return: Dash Bootstrap Components row containing table
     :rtype: dbc.Row
     """
-    all_labs = [
-        "Saskatchewan - Roy Romanow Provincial Laboratory(RRPL)",
-        "Nova Scotia Health Authority",
-        "Alberta ProvLab North(APLN)",
-        "Queen's University / Kingston Health Sciences Centre",
-        "National Microbiology Laboratory(NML)",
-        "BCCDC Public Health Laboratory",
-        "Public Health Ontario(PHO)",
-        "Newfoundland and Labrador - Eastern Health",
-        "Unity Health Toronto",
-        "Ontario Institute for Cancer Research(OICR)",
-        "Manitoba Cadham Provincial Laboratory"
-    ]
-
     ret = dbc.Row(
         [
             dbc.Col(
@@ -47,8 +49,7 @@ def get_footer_row_div(cidgoh_logo_path):
                 "https://virusseq-dataportal.ca/. We wish to acknowledge the "
                 "following organisations/laboratories for contributing data "
                 "to the Portal: Canadian Public Health Laboratory Network "
-                "(CPHLN), CanCOGGeN VirusSeq, " + ", ".join(all_labs)[:-1]
-                + ", and " + all_labs[-1] + ".",
+                "(CPHLN), CanCOGGeN VirusSeq, " + ALL_LABS_STR + ".",
             )
         ],
     )
@@ -4,16 +4,43 @@ The heatmap view is composed of several figures, because native figure
 functionality did not provide the view we wanted.
 
 We are not using the Plotly heatmap object. It is too slow. We are
-using the Plotly scatter object, and making it look like a heatmap.
+using the Plotly WebGL scatter object, and making it look like a
+heatmap.
 """
 
+from functools import lru_cache
+from itertools import groupby
+
 import dash_bootstrap_components as dbc
 import dash_html_components as html
 import dash_core_components as dcc
+import numpy as np
 import plotly.graph_objects as go
 
 from definitions import GENE_COLORS_DICT
 
+# Hover text of heatmap cells, filled in with the
+# ``data_parser.get_heatmap_hover_data`` values of each cell.
+HEATMAP_CELLS_HOVER_TEMPLATE = \
+    "<b>Mutation name:</b> %{customdata[0]}<br>" \
+    "Multiple AA mutations?: %{customdata[1]}<br>" \
+    "<br>" \
+    "Reference: %{customdata[2]}<br>" \
+    "Alternate: %{customdata[3]}<br>" \
+    "Alternate frequency: %{customdata[4]}<br>" \
+    "<br>" \
+    "<b>Functions:</b> <br>%{customdata[5]}" \
+    "<extra></extra>"
+
+# Custom Plotly color scale for mutation frequencies. A tuple, so it
+# can be shared by every fig without being copied or mutated.
+COLOR_SCALE = (
+    (0, "#ffffff"),
+    (0.0001, "#91bfdb"),
+    (1/2, "#ffffbf"),
+    (1, "#fc8d59"),
+)
+
 
 def get_color_scale():
     """Get custom Plotly color scale.
@@ -22,282 +49,232 @@ def get_color_scale():
     objects.
 
     :return: Acceptable Plotly colorscale value, with custom colours.
-    :rtype: list[list]
+    :rtype: tuple[tuple]
     """
-    ret = [
-        [0, "#ffffff"],
-        [0.0001, "#91bfdb"],
-        [1/2, "#ffffbf"],
-        [1, "#fc8d59"],
-    ]
-    return ret
+    return COLOR_SCALE
 
 
 def get_heatmap_row(data):
-    """Get Dash Bootstrap Components row containing heatmap columns.
+    """Get CSS grid div containing heatmap columns.
 
-    Several nested rows and columns are necessary to get the heatmap
-    view the way we want it.
+    The heatmap view is laid out as a single CSS grid with four
+    columns--strains axis, heatmap, sample size axis, and colorbar.
+    This renders far fewer elements than nesting Dash Bootstrap
+    Components rows and columns.
+
+    Figs are embedded as dicts, which are much faster to pickle than
+    Plotly figure objects, so the row can be cached.
 
     :param data: ``data_parser.get_data`` return value
     :type data: dict
-    :return: Dash Bootstrap Components row with multiple nested rows
-        and cols for heatmap view.
-    :rtype: dbc.Row
+    :return: CSS grid div with four columns for heatmap view
+    :rtype: html.Div
     """
     heatmap_cells_fig_height = data["heatmap_cells_fig_height"]
     heatmap_cells_container_height = data["heatmap_cells_container_height"]
     heatmap_cells_fig_width = data["heatmap_cells_fig_width"]
-    ret = dbc.Row(
+    ret = html.Div(
         [
-            dbc.Col(
+            html.Div(
                 [
                     # Space for voc and voi legend
-                    dbc.Row(
-                        dbc.Col(
-                            "Sample groups",
-                            className="text-right h5",
-                            style={"padding-top": 105, "padding-right": 15}
-                        ),
-                        style={"height": 130},
-                        no_gutters=True
+                    html.Div(
+                        "Sample groups",
+                        className="text-right h5 mb-0",
+                        style={"height": 130,
+                               "padding-top": 105,
+                               "padding-right": 15}
                     ),
                     # Space for y-axis fig; hackeyness for scrolling
                     # https://stackoverflow.com/a/49278385/11472358
-                    dbc.Row(
-                        dbc.Col(
-                            html.Div(
-                                html.Div(
-                                    dcc.Graph(
-                                        id="heatmap-strains-axis-fig",
-                                        figure=
-                                        get_heatmap_strains_axis_fig(data),
-                                        config={"displayModeBar": False},
-                                        style={
-                                            "height": heatmap_cells_fig_height,
-                                            # Need a scrollbar to match
-                                            # cells fig.
-                                            "width": "101%",
-                                            "marginBottom":
-                                                -heatmap_cells_container_height
-                                        }
-                                    ),
-                                    id="heatmap-strains-axis-inner-container",
-                                    style={
-                                        "height": "100%",
-                                        "overflowY": "scroll",
-                                        "marginBottom":
-                                            -heatmap_cells_container_height-50,
-                                        "paddingBottom":
-                                            heatmap_cells_container_height+50
-                                    }
-                                ),
-                                id="heatmap-strains-axis-outer-container",
+                    html.Div(
+                        html.Div(
+                            dcc.Graph(
+                                id="heatmap-strains-axis-fig",
+                                # Populated by a callback after the rest
+                                # of the row is rendered.
+                                figure={},
+                                config={"displayModeBar": False},
                                 style={
-                                    "height": heatmap_cells_container_height,
-                                    "overflow": "hidden"
+                                    "height": heatmap_cells_fig_height,
+                                    # Need a scrollbar to match cells fig.
+                                    "width": "101%",
+                                    "marginBottom":
+                                        -heatmap_cells_container_height
                                 }
-                            )
+                            ),
+                            id="heatmap-strains-axis-inner-container",
+                            style={
+                                "height": "100%",
+                                "overflowY": "scroll",
+                                "marginBottom":
+                                    -heatmap_cells_container_height-50,
+                                "paddingBottom":
+                                    heatmap_cells_container_height+50
+                            }
                         ),
-                        no_gutters=True
+                        id="heatmap-strains-axis-outer-container",
+                        style={
+                            "height": heatmap_cells_container_height,
+                            "overflow": "hidden"
+                        }
                     )
                 ],
-                width=2,
                 style={"overflowX": "visible"}
             ),
-            dbc.Col(
+            html.Div(
                 [
                     # Gene bar above heatmap
-                    dbc.Row(
-                        dbc.Col(
-                            dcc.Graph(
-                                id="heatmap-gene-bar-fig",
-                                figure=get_heatmap_gene_bar_fig(data),
-                                config={"displayModeBar": False},
-                                style={"height": 30,
-                                       "width": heatmap_cells_fig_width}
-                            )
-                        ),
-                        no_gutters=True
+                    dcc.Graph(
+                        id="heatmap-gene-bar-fig",
+                        figure=get_heatmap_gene_bar_fig(data).to_dict(),
+                        config={"displayModeBar": False},
+                        style={"height": 30,
+                               "width": heatmap_cells_fig_width}
                     ),
                     # Protein bar above heatmap
-                    dbc.Row(
-                        dbc.Col(
-                            dcc.Graph(
-                                id="heatmap-nsp-bar-fig",
-                                figure=get_heatmap_nsp_bar_fig(data),
-                                config={"displayModeBar": False},
-                                style={"height": 30,
-                                       "width": heatmap_cells_fig_width}
-                            )
-                        ),
-                        no_gutters=True
+                    dcc.Graph(
+                        id="heatmap-nsp-bar-fig",
+                        figure=get_heatmap_nsp_bar_fig(data).to_dict(),
+                        config={"displayModeBar": False},
+                        style={"height": 30,
+                               "width": heatmap_cells_fig_width}
                     ),
                     # Nucleotide position axis
-                    dbc.Row(
-                        dbc.Col(
-                            dcc.Graph(
-                                id="heatmap-nt-pos-axis-fig",
-                                figure=get_heatmap_nt_pos_axis_fig(data),
-                                config={"displayModeBar": False},
-                                style={"height": 75,
-                                       "width": heatmap_cells_fig_width}
-                            )
-                        )
+                    dcc.Graph(
+                        id="heatmap-nt-pos-axis-fig",
+                        figure=get_heatmap_nt_pos_axis_fig(data).to_dict(),
+                        config={"displayModeBar": False},
+                        style={"height": 75,
+                               "width": heatmap_cells_fig_width}
                     ),
                     # Heatmap cells; some hackeyness for scrolling
                     # https://stackoverflow.com/a/49278385/11472358
-                    dbc.Row(
-                        dbc.Col(
-                            html.Div(
-                                html.Div(
-                                    dcc.Graph(
-                                        id="heatmap-cells-fig",
-                                        figure=get_heatmap_cells_fig(data),
-                                        config={"displayModeBar": False},
-                                        style={
-                                            "height": heatmap_cells_fig_height,
-                                            "width": heatmap_cells_fig_width,
-                                            "marginRight":
-                                                -heatmap_cells_fig_width,
-                                            "marginBottom":
-                                                -heatmap_cells_container_height
-                                        }
-                                    ),
-                                    id="heatmap-cells-inner-container",
-                                    style={
-                                        "height": "100%",
-                                        "width": "100%",
-                                        "overflow": "scroll",
-                                        "marginRight":
-                                            -heatmap_cells_fig_width-50,
-                                        "paddingRight":
-                                            heatmap_cells_fig_width+50,
-                                        "marginBottom":
-                                            -heatmap_cells_container_height-50,
-                                        "paddingBottom":
-                                            heatmap_cells_container_height+50
-                                    }
-                                ),
-                                id="heatmap-cells-outer-container",
+                    html.Div(
+                        html.Div(
+                            dcc.Graph(
+                                id="heatmap-cells-fig",
+                                figure=get_heatmap_cells_fig(data),
+                                config={"displayModeBar": False},
                                 style={
-                                    "height": heatmap_cells_container_height,
+                                    "height": heatmap_cells_fig_height,
                                     "width": heatmap_cells_fig_width,
-                                    "overflow": "hidden"
+                                    "marginRight": -heatmap_cells_fig_width,
+                                    "marginBottom":
+                                        -heatmap_cells_container_height
                                 }
-                            )
+                            ),
+                            id="heatmap-cells-inner-container",
+                            style={
+                                "height": "100%",
+                                "width": "100%",
+                                "overflow": "scroll",
+                                "marginRight": -heatmap_cells_fig_width-50,
+                                "paddingRight": heatmap_cells_fig_width+50,
+                                "marginBottom":
+                                    -heatmap_cells_container_height-50,
+                                "paddingBottom":
+                                    heatmap_cells_container_height+50
+                            }
                         ),
-                        no_gutters=True
+                        id="heatmap-cells-outer-container",
+                        style={
+                            "height": heatmap_cells_container_height,
+                            "width": heatmap_cells_fig_width,
+                            "overflow": "hidden"
+                        }
                     ),
                     # Amino acid axis
-                    dbc.Row(
-                        dbc.Col(
-                            dcc.Graph(
-                                id="heatmap-aa-pos-axis-fig",
-                                figure=get_heatmap_aa_pos_axis_fig(data),
-                                config={"displayModeBar": False},
-                                style={"height": 140,
-                                       "width": heatmap_cells_fig_width}
-                            )
-                        ),
-                        no_gutters=True
+                    dcc.Graph(
+                        id="heatmap-aa-pos-axis-fig",
+                        figure=get_heatmap_aa_pos_axis_fig(data).to_dict(),
+                        config={"displayModeBar": False},
+                        style={"height": 140,
+                               "width": heatmap_cells_fig_width}
                     ),
                 ],
                 id="heatmap-center-div",
                 className="pl-4",
-                width=8,
                 style={"overflowX": "scroll"}
             ),
-            dbc.Col(
+            html.Div(
                 [
                     # Empty space above sample size axis
-                    dbc.Row(
-                        dbc.Col(
-                            "N",
-                            className="h5 font-italic",
-                            style={"padding-top": 105, "padding-left": 15}
-                        ),
-                        style={"height": 130},
-                        no_gutters=True
+                    html.Div(
+                        "N",
+                        className="h5 font-italic mb-0",
+                        style={"height": 130,
+                               "padding-top": 105,
+                               "padding-left": 15}
                     ),
                     # Space for sample size axis; some hackeyness for
                     # scrolling
                     # https://stackoverflow.com/a/49278385/11472358
-                    dbc.Row(
-                        dbc.Col(
-                            html.Div(
-                                html.Div(
-                                    dcc.Graph(
-                                        id="heatmap-sample-size-axis-fig",
-                                        figure=
-                                        get_heatmap_sample_size_axis_fig(data),
-                                        config={"displayModeBar": False},
-                                        style={
-                                            "height": heatmap_cells_fig_height,
-                                            # Need a scrollbar to match
-                                            # cells fig.
-                                            "width": "125%",
-                                            "marginBottom":
-                                                -heatmap_cells_container_height
-                                        }
-                                    ),
-                                    id="heatmap-sample-size-axis-inner-"
-                                       "container",
-                                    style={
-                                        "height": "100%",
-                                        "overflowX": "scroll",
-                                        "overflowY": "scroll",
-                                        "marginRight": -50,
-                                        "paddingRight": 50,
-                                        "marginBottom":
-                                            -heatmap_cells_container_height-50,
-                                        "paddingBottom":
-                                            heatmap_cells_container_height+50
-                                    }
-                                ),
-                                id="heatmap-sample-size-axis-outer-container",
+                    html.Div(
+                        html.Div(
+                            dcc.Graph(
+                                id="heatmap-sample-size-axis-fig",
+                                # Populated by a callback after the rest
+                                # of the row is rendered.
+                                figure={},
+                                config={"displayModeBar": False},
                                 style={
-                                    "height": heatmap_cells_container_height,
-                                    "overflow": "hidden"
+                                    "height": heatmap_cells_fig_height,
+                                    # Need a scrollbar to match cells fig.
+                                    "width": "125%",
+                                    "marginBottom":
+                                        -heatmap_cells_container_height
                                 }
-                            )
+                            ),
+                            id="heatmap-sample-size-axis-inner-container",
+                            style={
+                                "height": "100%",
+                                "overflowX": "scroll",
+                                "overflowY": "scroll",
+                                "marginRight": -50,
+                                "paddingRight": 50,
+                                "marginBottom":
+                                    -heatmap_cells_container_height-50,
+                                "paddingBottom":
+                                    heatmap_cells_container_height+50
+                            }
                         ),
-                        no_gutters=True
+                        id="heatmap-sample-size-axis-outer-container",
+                        style={
+                            "height": heatmap_cells_container_height,
+                            "overflow": "hidden"
+                        }
                     )
-                ],
-                width=1
+                ]
             ),
-            dbc.Col(
+            html.Div(
                 [
                     # Space for single genome legend
-                    dbc.Row(
-                        dbc.Col(
-                            "Alt freq",
-                            className="h5",
-                            style={"padding-top": 75}
-                        ),
-                        style={"height": 100},
-                        no_gutters=True
+                    html.Div(
+                        "Alt freq",
+                        className="h5 mb-0",
+                        style={"height": 100, "padding-top": 75}
                     ),
                     # Space for colorbar fig
-                    dbc.Row(
-                        dbc.Col(
-                            dcc.Graph(
-                                id="heatmap-colorbar-fig",
-                                figure=get_heatmap_colorbar_fig(),
-                                config={"displayModeBar": False},
-                            )
-                        ),
-                        no_gutters=True
+                    dcc.Graph(
+                        id="heatmap-colorbar-fig",
+                        figure=get_heatmap_colorbar_fig().to_dict(),
+                        config={"displayModeBar": False},
                     )
                 ],
-                width=1,
                 style={"overflowX": "hidden"}
             ),
             get_mutation_details_modal()
         ],
-        no_gutters=True,
-        className="mt-3"
+        className="mt-3",
+        style={
+            "display": "grid",
+            # Same proportions as the old 2/8/1/1 bootstrap cols. The
+            # minimum of 0 stops the wide heatmap from stretching its
+            # column.
+            "gridTemplateColumns":
+                "minmax(0, 2fr) minmax(0, 8fr) minmax(0, 1fr) minmax(0, 1fr)"
+        }
     )
     return ret
 
@@ -314,49 +291,34 @@ def get_heatmap_strains_axis_fig(data):
     :return: Plotly figure containing heatmap strains axis
     :rtype: go.Figure
     """
-    ret = go.Figure({})
-    ret.update_layout(
-        xaxis_type="linear",
-        yaxis_type="linear",
-        plot_bgcolor="white",
-        font={
-            "size": 16
-        },
-        margin={
-            "l": 300,
-            "r": 0,
-            "t": 0,
-            "b": 0
+    ret = go.Figure(
+        {},
+        layout={
+            "font": {
+                "size": 16
+            },
+            "plot_bgcolor": "white",
+            "margin": {
+                "l": 300, "r": 0, "t": 0, "b": 0
+            },
+            "xaxis": {
+                "fixedrange": True,
+                "type": "linear",
+                "visible": False
+            },
+            "yaxis": {
+                "fixedrange": True,
+                "range": [-0.5, len(data["heatmap_y_strains"])-0.5],
+                "type": "linear",
+                "tickmode": "array",
+                "tick0": 0,
+                "dtick": 1,
+                "tickvals": list(range(len(data["heatmap_y_strains"]))),
+                "ticktext": data["heatmap_y_strains_tick_text"],
+                "ticklabelposition": "outside"
+            }
         }
     )
-    ret.update_xaxes(fixedrange=True,
-                     visible=False)
-
-    tick_text = []
-    for strain in data["heatmap_y_strains"]:
-        if strain in data["voc_strains"]:
-            strain_text = "<b>%s</b>" % strain
-        elif strain in data["voi_strains"]:
-            strain_text = "<i>%s</i>" % strain
-        else:
-            strain_text = strain
-
-        if data["variants_dict"][strain] != "n/a":
-            strain_text += " (" + data["variants_dict"][strain] + ")"
-
-        if strain in data["circulating_strains"]:
-            strain_text += "⚠️"
-
-        tick_text.append(strain_text)
-
-    ret.update_yaxes(range=[-0.5, len(data["heatmap_y_strains"])-0.5],
-                     fixedrange=True,
-                     tickmode="array",
-                     tick0=0,
-                     dtick=1,
-                     tickvals=list(range(len(data["heatmap_y_strains"]))),
-                     ticktext=tick_text,
-                     ticklabelposition="outside")
     return ret
 
 
@@ -372,30 +334,35 @@ def get_heatmap_sample_size_axis_fig(data):
     :return: Plotly figure containing heatmap sample size y axis
     :rtype: go.Figure
     """
-    ret = go.Figure({})
-    ret.update_layout(
-        xaxis_type="linear",
-        yaxis_type="linear",
-        plot_bgcolor="white",
-        font={
-            "size": 16
-        },
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 0
+    ret = go.Figure(
+        {},
+        layout={
+            "font": {
+                "size": 16
+            },
+            "plot_bgcolor": "white",
+            "margin": {
+                "l": 0, "r": 0, "t": 0, "b": 0
+            },
+            "xaxis": {
+                "fixedrange": True,
+                "type": "linear",
+                "visible": False
+            },
+            "yaxis": {
+                "fixedrange": True,
+                "range": [-0.5, len(data["heatmap_y_sample_sizes"])-0.5],
+                "type": "linear",
+                "tickmode": "array",
+                "tick0": 0,
+                "dtick": 1,
+                "tickvals":
+                    list(range(len(data["heatmap_y_sample_sizes"]))),
+                "ticktext": data["heatmap_y_sample_sizes"],
+                "ticklabelposition": "inside"
+            }
         }
     )
-    ret.update_xaxes(fixedrange=True, visible=False)
-    ret.update_yaxes(range=[-0.5, len(data["heatmap_y_sample_sizes"])-0.5],
-                     fixedrange=True,
-                     tickmode="array",
-                     tick0=0,
-                     dtick=1,
-                     tickvals=list(range(len(data["heatmap_y_sample_sizes"]))),
-                     ticktext=data["heatmap_y_sample_sizes"],
-                     ticklabelposition="inside")
     return ret
 
 
@@ -442,30 +409,16 @@ def get_heatmap_gene_bar_graph_obj(data):
     :return: Plotly bar object containing gene bar with labels
     :rtype: go.Bar
     """
-    ret_x = []
-    ret_text = []
-    ret_color = []
-
-    bar_len = 0
-    last_gene_seen = ""
-    for i, gene in enumerate(data["heatmap_x_genes"]):
-        if i == 0:
-            last_gene_seen = gene
-        if gene != last_gene_seen:
-            ret_x.append(bar_len)
-            ret_color.append(GENE_COLORS_DICT[last_gene_seen])
-            if bar_len > 2:
-                ret_text.append(last_gene_seen)
-            else:
-                ret_text.append("")
-
-            last_gene_seen = gene
-            bar_len = 0
-        bar_len += 1
-        if i == (len(data["heatmap_x_genes"]) - 1):
-            ret_x.append(bar_len)
-            ret_text.append(gene)
-            ret_color.append(GENE_COLORS_DICT[gene])
+    # Consecutive runs of the same gene, as (gene, run length) pairs
+    gene_runs = [(gene, sum(1 for _ in group))
+                 for gene, group in groupby(data["heatmap_x_genes"])]
+
+    ret_x = [bar_len for _, bar_len in gene_runs]
+    ret_color = [GENE_COLORS_DICT[gene] for gene, _ in gene_runs]
+    ret_text = [gene if bar_len > 2 else "" for gene, bar_len in gene_runs]
+    # The last gene is always labelled, regardless of its length
+    if gene_runs:
+        ret_text[-1] = gene_runs[-1][0]
 
     ret = go.Bar(
         x=ret_x,
@@ -527,24 +480,12 @@ def get_heatmap_nsp_bar_graph_obj(data):
     :return: Plotly bar object containing NSP bar with labels
     :rtype: go.Bar
     """
-    ret_x = []
-    ret_text = []
-
-    bar_len = 0
-    last_nsp_seen = ""
-    for i, nsp in enumerate(data["heatmap_x_nsps"]):
-        if i == 0:
-            last_nsp_seen = nsp
-        if nsp != last_nsp_seen:
-            ret_x.append(bar_len)
-            ret_text.append(last_nsp_seen)
-
-            last_nsp_seen = nsp
-            bar_len = 0
-        bar_len += 1
-        if i == (len(data["heatmap_x_nsps"]) - 1):
-            ret_x.append(bar_len)
-            ret_text.append(nsp)
+    # Consecutive runs of the same NSP, as (NSP, run length) pairs
+    nsp_runs = [(nsp, sum(1 for _ in group))
+                for nsp, group in groupby(data["heatmap_x_nsps"])]
+
+    ret_x = [bar_len for _, bar_len in nsp_runs]
+    ret_text = [nsp for nsp, _ in nsp_runs]
 
     ret_text = ["" if e == "n/a" else e for e in ret_text]
     ret_color = ["purple" if e else "white" for e in ret_text]
@@ -554,10 +495,10 @@ def get_heatmap_nsp_bar_graph_obj(data):
     for i, (bar_len, nsp) in enumerate(zip(ret_x, ret_text)):
         if not ret_text:
             continue
-        delimiter = "".join([" " for _ in nsp])
+        delimiter = " " * len(nsp)
         label_len = bar_len // 2
         if label_len:
-            label = delimiter.join([nsp for _ in range(label_len)])
+            label = delimiter.join([nsp] * label_len)
         # Not enough room for NSP label to fit, but we will cram it in
         else:
             label = nsp
@@ -591,38 +532,45 @@ def get_heatmap_aa_pos_axis_fig(data):
     :return: Plotly figure containing amino acid axis
     :rtype: go.Figure
     """
-    ret = go.Figure({})
-    ret.update_layout(
-        xaxis_type="linear",
-        yaxis_type="linear",
-        plot_bgcolor="white",
-        font={
-            "size": 16
-        },
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 500
+    # Unlike nt pos axis, vals in aa pos axis can repeat. So to account
+    # for heterozygous mutations we pair them with nt pos values, and
+    # then remove duplicate pairs. Cols are sorted by nt pos, so
+    # duplicate pairs are always next to each other.
+    nt_pos = np.array(data["heatmap_x_nt_pos"], dtype=str)
+    aa_pos = np.array(data["heatmap_x_aa_pos"], dtype=str)
+    pair_changed = np.ones(len(nt_pos), dtype=bool)
+    pair_changed[1:] = \
+        (nt_pos[1:] != nt_pos[:-1]) | (aa_pos[1:] != aa_pos[:-1])
+    tick_text = aa_pos[pair_changed].tolist()
+
+    ret = go.Figure(
+        {},
+        layout={
+            "font": {
+                "size": 16
+            },
+            "plot_bgcolor": "white",
+            "margin": {
+                "l": 0, "r": 0, "t": 0, "b": 500
+            },
+            "xaxis": {
+                "fixedrange": True,
+                "range": [-0.5, len(data["heatmap_x_nt_pos"])-0.5],
+                "type": "linear",
+                "tickmode": "array",
+                "tickvals": data["heatmap_x_tickvals"],
+                "ticktext": tick_text,
+                "ticklabelposition": "outside",
+                "tickangle": 90
+            },
+            "yaxis": {
+                "fixedrange": True,
+                "type": "linear",
+                "visible": False,
+                "zeroline": True
+            }
         }
     )
-
-    # Unlike nt pos axis, vals in aa pos axis can repeat. So to account
-    # for heterozygous mutations we zip with nt pos values, and then
-    # remove duplicates.
-    zipped_axes = zip(data["heatmap_x_nt_pos"], data["heatmap_x_aa_pos"])
-    tick_text = [aa for (_, aa) in dict.fromkeys(zipped_axes)]
-
-    ret.update_xaxes(range=[-0.5, len(data["heatmap_x_nt_pos"])-0.5],
-                     fixedrange=True,
-                     tickmode="array",
-                     tickvals=data["heatmap_x_tickvals"],
-                     ticktext=tick_text,
-                     ticklabelposition="outside",
-                     tickangle=90)
-    ret.update_yaxes(fixedrange=True,
-                     visible=False,
-                     zeroline=True)
     return ret
 
 
@@ -634,32 +582,42 @@ def get_heatmap_nt_pos_axis_fig(data):
     :return: Plotly figure containing nt pos axis
     :rtype: go.Figure
     """
-    ret = go.Figure({})
-    ret.update_layout(
-        xaxis_type="linear",
-        yaxis_type="linear",
-        plot_bgcolor="white",
-        font={
-            "size": 16
-        },
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 500,
-            "b": 0
+    # Remove duplicate nt pos values. Cols are sorted by nt pos, so
+    # duplicates are always next to each other.
+    nt_pos = np.array(data["heatmap_x_nt_pos"], dtype=str)
+    pos_changed = np.ones(len(nt_pos), dtype=bool)
+    pos_changed[1:] = nt_pos[1:] != nt_pos[:-1]
+    tick_text = nt_pos[pos_changed].tolist()
+
+    ret = go.Figure(
+        {},
+        layout={
+            "font": {
+                "size": 16
+            },
+            "plot_bgcolor": "white",
+            "margin": {
+                "l": 0, "r": 0, "t": 500, "b": 0
+            },
+            "xaxis": {
+                "fixedrange": True,
+                "range": [-0.5, len(data["heatmap_x_nt_pos"])-0.5],
+                "type": "linear",
+                "tickmode": "array",
+                "tickvals": data["heatmap_x_tickvals"],
+                "ticktext": tick_text,
+                "side": "top",
+                "ticklabelposition": "outside",
+                "tickangle": 90
+            },
+            "yaxis": {
+                "fixedrange": True,
+                "type": "linear",
+                "visible": False,
+                "zeroline": True
+            }
         }
     )
-    ret.update_xaxes(range=[-0.5, len(data["heatmap_x_nt_pos"])-0.5],
-                     fixedrange=True,
-                     tickmode="array",
-                     tickvals=data["heatmap_x_tickvals"],
-                     ticktext=list(dict.fromkeys(data["heatmap_x_nt_pos"])),
-                     side="top",
-                     ticklabelposition="outside",
-                     tickangle=90)
-    ret.update_yaxes(fixedrange=True,
-                     visible=False,
-                     zeroline=True)
     return ret
 
 
@@ -670,50 +628,61 @@ def get_heatmap_cells_fig(data):
     :type data: dict
     :return: Plotly figure containing heatmap cells, insertion
         markers, and deletion markers.
-    :rtype: go.Figure
+    :rtype: dict
     """
-    ret = go.Figure(get_heatmap_cells_graph_obj(data))
-    ret.add_trace(get_heatmap_main_insertions_graph_obj(data))
-    ret.add_trace(get_heatmap_main_deletions_graph_obj(data))
-
-    ret.update_layout(
-        xaxis_type="linear",
-        yaxis_type="linear",
-        plot_bgcolor="white",
-        font={
-            "size": 16
-        },
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 0,
-            "pad": 0
+    ret = go.Figure(
+        layout={
+            "font": {
+                "size": 16
+            },
+            "plot_bgcolor": "white",
+            # Only look for cells within a few pixels of the cursor when
+            # hovering and drawing the spike line crosshair, instead of
+            # scanning every cell on each mouse move. A spikedistance of
+            # 0 would turn the spike lines off entirely.
+            "hovermode": "closest",
+            "hoverdistance": 10,
+            "spikedistance": 10,
+            "margin": {
+                "l": 0, "r": 0, "t": 0, "b": 0, "pad": 0
+            },
+            "xaxis": {
+                "fixedrange": True,
+                "range": [-0.5, len(data["heatmap_x_nt_pos"])-0.5],
+                "type": "linear",
+                "tickmode": "array",
+                "tickvals": data["heatmap_cells_tickvals"],
+                "visible": True,
+                "showticklabels": False,
+                "zeroline": False,
+                "gridcolor": "grey",
+                "showspikes": True,
+                "spikecolor": "black",
+                "side": "top"
+            },
+            "yaxis": {
+                "fixedrange": True,
+                "range": [-0.5, len(data["heatmap_y_strains"])-0.5],
+                "type": "linear",
+                "tickmode": "linear",
+                "tick0": 0.5,
+                "dtick": 1,
+                "visible": True,
+                "showticklabels": False,
+                "zeroline": False,
+                "gridcolor": "black",
+                "showspikes": True,
+                "spikecolor": "black"
+            }
         }
     )
-    ret.update_xaxes(range=[-0.5, len(data["heatmap_x_nt_pos"])-0.5],
-                     tickmode="array",
-                     tickvals=data["heatmap_cells_tickvals"],
-                     fixedrange=True,
-                     visible=True,
-                     showticklabels=False,
-                     zeroline=False,
-                     gridcolor="grey",
-                     showspikes=True,
-                     spikecolor="black",
-                     side="top")
-    ret.update_yaxes(range=[-0.5, len(data["heatmap_y_strains"])-0.5],
-                     tickmode="linear",
-                     tick0=0.5,
-                     dtick=1,
-                     fixedrange=True,
-                     visible=True,
-                     showticklabels=False,
-                     zeroline=False,
-                     gridcolor="black",
-                     showspikes=True,
-                     spikecolor="black")
 
+    # The traces are dicts, which Plotly does not validate, so we add
+    # them to the validated layout as a dict too. The cells go first,
+    # so the indel markers are drawn on top of them.
+    ret = ret.to_dict()
+    ret["data"] = [get_heatmap_cells_graph_obj(data)]
+    ret["data"].append(get_heatmap_main_indels_graph_obj(data))
     return ret
 
 
@@ -721,105 +690,104 @@ def get_heatmap_cells_graph_obj(data):
     """Get Plotly graph object representing heatmap cells.
 
     This is actually a scatter object, not a heatmap object. We make
-    it look like a heatmap object. This is faster.
+    it look like a heatmap object. This is faster. We use the WebGL
+    version of the scatter object, so the browser does not have to
+    draw an SVG node for every cell.
+
+    We return the trace as a dict, instead of a ``go.Scattergl``
+    object, because Plotly validates every element of every array
+    passed to graph objects, which is slow for large heatmaps.
 
     :param data: ``data_parser.get_data`` return value
     :type data: dict
-    :return: Plotly graph object containing cells
-    :rtype: go.Scatter
+    :return: Plotly scattergl trace containing cells
+    :rtype: dict
     """
-    scatter_y = []
-    scatter_x = []
-    scatter_marker_color = []
-    scatter_text = []
-    scatter_line_width = []
-    for i, pos in enumerate(data["heatmap_x_nt_pos"]):
-        for j, strain in enumerate(data["heatmap_y_strains"]):
-            freq = data["heatmap_z"][j][i]
-            if freq is not None:
-                scatter_x.append(i)
-                scatter_y.append(j)
-                scatter_marker_color.append(float(freq))
-                scatter_text.append(data["heatmap_hover_text"][j][i])
-
-                mutation_fns = data["heatmap_mutation_fns"][j][i]
-                scatter_line_width.append(2 if mutation_fns is None else 4)
-    ret = go.Scatter(
-        x=scatter_x,
-        y=scatter_y,
-        mode="markers",
-        marker={
+    y_len = len(data["heatmap_y_strains"])
+    x_len = len(data["heatmap_x_nt_pos"])
+    # None values become nan, so they are easy to find
+    heatmap_z = \
+        np.array(data["heatmap_z"], dtype=float).reshape(y_len, x_len)
+    mutation_fns = \
+        np.array(data["heatmap_mutation_fns"], dtype=object).reshape(y_len,
+                                                                     x_len)
+    # Transposing first orders the cells by x, and then by y
+    scatter_x, scatter_y = np.nonzero(~np.isnan(heatmap_z.T))
+    scatter_marker_color = heatmap_z[scatter_y, scatter_x]
+    scatter_line_width = \
+        np.where(np.equal(mutation_fns[scatter_y, scatter_x], None), 2, 4)
+
+    # Plotly sends arrays to the browser as binary buffers, which our
+    # version of plotly.js cannot read. So we send lists.
+    scatter_x = scatter_x.tolist()
+    scatter_y = scatter_y.tolist()
+    scatter_marker_color = scatter_marker_color.tolist()
+    scatter_line_width = scatter_line_width.tolist()
+    # Each cell's hover values are a list, which numpy would try to
+    # broadcast, so we select them from the flattened rows instead.
+    hover_data = [e for row in data["heatmap_hover_data"] for e in row]
+    scatter_customdata = \
+        [hover_data[y * x_len + x] for x, y in zip(scatter_x, scatter_y)]
+    ret = {
+        "type": "scattergl",
+        "x": scatter_x,
+        "y": scatter_y,
+        "mode": "markers",
+        "marker": {
             "color": scatter_marker_color,
-            "colorscale": get_color_scale(),
+            "colorscale": COLOR_SCALE,
             "cmin": 0,
             "cmax": 1,
             "symbol": "square",
             "line": {"width": scatter_line_width},
             "size": 30
         },
-        hoverlabel={
+        "hoverlabel": {
             "bgcolor": "#000000",
-            "font_size": 16
+            "font": {"size": 16}
         },
-        hovertemplate="%{text}<extra></extra>",
-        text=scatter_text,
-        showlegend=False
-    )
+        "hovertemplate": HEATMAP_CELLS_HOVER_TEMPLATE,
+        "customdata": scatter_customdata,
+        "showlegend": False
+    }
     return ret
 
 
-def get_heatmap_main_insertions_graph_obj(data):
-    """Get Plotly graph object of heatmap insertion markers.
+def get_heatmap_main_indels_graph_obj(data):
+    """Get Plotly graph object of heatmap insertion and deletion markers.
 
-    We overlay this on the base trace containing the cells.
+    We overlay this on the base trace containing the cells. Insertions
+    and deletions share one trace, with different symbols and colours
+    per marker, so the browser has one less WebGL trace to draw. Like
+    the cells trace, it is a dict, so Plotly does not validate every
+    marker.
 
     :param data: ``data_parser.get_data`` return value
     :type data: dict
-    :return: Plotly scatterplot object containing insertion markers
-    :rtype: go.Scatter
+    :return: Plotly scattergl trace containing insertion and deletion
+        markers.
+    :rtype: dict
     """
-    ret = go.Scatter(
-        x=data["insertions_x"],
-        y=data["insertions_y"],
-        hoverinfo="skip",
-        mode="markers",
-        marker={
-            "color": "lime",
+    insertions_len = len(data["insertions_x"])
+    deletions_len = len(data["deletions_x"])
+    ret = {
+        "type": "scattergl",
+        "x": data["insertions_x"] + data["deletions_x"],
+        "y": data["insertions_y"] + data["deletions_y"],
+        "hoverinfo": "skip",
+        "mode": "markers",
+        "marker": {
+            "color": ["lime"] * insertions_len + ["red"] * deletions_len,
             "size": 12,
-            "symbol": "cross",
+            "symbol": ["cross"] * insertions_len + ["x"] * deletions_len,
             "line": {"width": 2}
         },
-        showlegend=False
-    )
-    return ret
-
-
-def get_heatmap_main_deletions_graph_obj(data):
-    """Get Plotly graph object of heatmap deletion markers.
-
-    We overlay this on the base trace containing the cells.
-
-    :param data: ``data_parser.get_data`` return value
-    :type data: dict
-    :return: Plotly scatterplot object containing deletion markers
-    :rtype: go.Scatter
-    """
-    ret = go.Scatter(
-        x=data["deletions_x"],
-        y=data["deletions_y"],
-        hoverinfo="skip",
-        mode="markers",
-        marker={
-            "color": "red",
-            "size": 12,
-            "symbol": "x",
-            "line": {"width": 2}
-        },
-        showlegend=False
-    )
+        "showlegend": False
+    }
     return ret
 
 
+@lru_cache(maxsize=None)
 def get_heatmap_colorbar_fig():
     """Get Plotly figure used as mock colorbar.
 
@@ -828,28 +796,31 @@ def get_heatmap_colorbar_fig():
     colorbar as you scroll the center heatmap figure. This gives the
     illusion of one.
 
+    The fig does not depend on any data, so it is only built once, and
+    the same object is returned on every call. Do not mutate it.
+
     :return: Plotly figure containing heatmap colorbar
     :rtype: go.Figure
     """
-    ret = go.Figure(get_heatmap_colorbar_graph_obj())
-    ret.update_layout(
-        font={"size": 16},
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 0,
-            "pad": 0
-        },
-        plot_bgcolor="white",
-        xaxis={
-            "visible": False,
-            "range": [0, 0],
-            "fixedrange": True
-        },
-        yaxis={
-            "visible": False,
-            "fixedrange": True
+    ret = go.Figure(
+        get_heatmap_colorbar_graph_obj(),
+        layout={
+            "font": {
+                "size": 16
+            },
+            "plot_bgcolor": "white",
+            "margin": {
+                "l": 0, "r": 0, "t": 0, "b": 0, "pad": 0
+            },
+            "xaxis": {
+                "fixedrange": True,
+                "range": [0, 0],
+                "visible": False
+            },
+            "yaxis": {
+                "fixedrange": True,
+                "visible": False
+            }
         }
     )
     return ret
@@ -871,7 +842,7 @@ def get_heatmap_colorbar_graph_obj():
         mode="markers",
         marker={
             "color": "#ffffff",
-            "colorscale": get_color_scale(),
+            "colorscale": COLOR_SCALE,
             "cmin": 0,
             "cmax": 1,
             "showscale": True,
@@ -884,10 +855,13 @@ def get_heatmap_colorbar_graph_obj():
     return ret
 
 
+@lru_cache(maxsize=None)
 def get_mutation_details_modal():
     """Returns mutation details modal.
 
     This modal is initially closed, and the header and body are empty.
+    It is only built once, and the same object is returned on every
+    call. Do not mutate it.
 
     :return: Initially closed Dash Bootstrap Components modal for
         displaying details on mutations.
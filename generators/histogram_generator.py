@@ -1,6 +1,6 @@
 """Functions for generating histogram view."""
 
-import math
+from functools import lru_cache
 
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
@@ -58,10 +58,11 @@ def get_histogram_top_row(data):
     :rtype: dbc.Row
     """
     np_histogram = get_np_histogram(data)
+    counts_max = int(np_histogram[0].max())
     ret = [
         dbc.Col(
             dcc.Graph(
-                figure=get_histogram_mock_axis(np_histogram),
+                figure=get_histogram_mock_axis(counts_max),
                 config={"displayModeBar": False},
                 style={"height": "7rem"}
             ),
@@ -80,41 +81,57 @@ def get_histogram_top_row(data):
     return ret
 
 
-def get_histogram_mock_axis(np_histogram):
+def get_histogram_mock_axis(counts_max):
     """Get the mock axis figure next to the histogram.
 
     This is a scatter plot, that uses the max value from the histogram
     to produce a mock y axis.
 
-    :param np_histogram: Numpy histogram object used to produce bars in
-        histogram view.
-    :type np_histogram: tuple
+    :param counts_max: Highest bar count in the histogram view
+    :type counts_max: int
     :return: Figure containing scatter plot representing mock histogram
         axis.
-    :rtype: go.Figure
+    :rtype: dict
     """
-    ret = make_subplots(rows=2,
-                        cols=1,
-                        row_heights=[0.7, 0.3],
-                        vertical_spacing=0)
-    counts = np_histogram[0]
-    mock_obj = go.Scatter(
-        x=[95, 95],
-        y=[0, 100],
-        mode="lines+text",
-        line={"color": "black"},
-        text=["0 ", "%s " % counts.max()],
-        textposition=["top left", "bottom left"],
-        hoverinfo="skip"
-    )
-    ret.add_trace(mock_obj, row=1, col=1)
-    ret.update_layout(
-        margin={"t": 0, "b": 0, "l": 0, "r": 0, "pad": 0},
-        plot_bgcolor="white",
-        font={"size": 16},
-        xaxis1={"visible": False, "range": [0, 100], "fixedrange": True},
-        yaxis1={"visible": False, "range": [0, 100], "fixedrange": True},
+    mock_obj = {
+        "type": "scatter",
+        "x": [95, 95],
+        "y": [0, 100],
+        "mode": "lines+text",
+        "line": {"color": "black"},
+        "text": ["0 ", "%s " % counts_max],
+        "textposition": ["top left", "bottom left"],
+        "hoverinfo": "skip"
+    }
+    ret = {"data": [mock_obj], "layout": get_histogram_mock_axis_layout()}
+    return ret
+
+
+@lru_cache(maxsize=None)
+def get_histogram_mock_axis_layout():
+    """Get Plotly layout of the mock axis figure next to the histogram.
+
+    The layout does not depend on the data, so it is only built and
+    validated once. Callers must not mutate the returned dict. Only the
+    first row of the histogram subplots is mocked, so instead of
+    building subplots we give the y axis the same domain as that row.
+
+    :return: Plotly layout of figure representing mock histogram axis
+    :rtype: dict
+    """
+    ret = go.Figure(
+        layout={
+            "margin": {"t": 0, "b": 0, "l": 0, "r": 0, "pad": 0},
+            "plot_bgcolor": "white",
+            "font": {"size": 16},
+            "xaxis": {"visible": False, "range": [0, 100], "fixedrange": True},
+            "yaxis": {"visible": False,
+                      "range": [0, 100],
+                      "fixedrange": True,
+                      "domain": [0.3, 1]}
+        }
     )
+    ret = ret.to_dict()["layout"]
     return ret
 
 
@@ -125,15 +142,30 @@ def get_histogram_fig(np_histogram):
         histogram view.
     :type np_histogram: tuple
     :return: Plotly figure representing histogram view
-    :rtype: go.Figure
+    :rtype: dict
+    """
+    # The gene bars go in the second row of the subplots
+    data = [get_histogram_graph_obj(np_histogram)]
+    for bar_obj in get_histogram_gene_bar_obj_list():
+        data.append({**bar_obj, "xaxis": "x2", "yaxis": "y2"})
+    ret = {"data": data, "layout": get_histogram_fig_layout()}
+    return ret
+
+
+@lru_cache(maxsize=None)
+def get_histogram_fig_layout():
+    """Get Plotly layout of axis-less histogram and gene bar figure.
+
+    The layout does not depend on the data, so it is only built and
+    validated once. Callers must not mutate the returned dict.
+
+    :return: Plotly layout of figure representing histogram view
+    :rtype: dict
     """
     ret = make_subplots(rows=2,
                         cols=1,
                         row_heights=[0.7, 0.3],
                         vertical_spacing=0)
-    ret.add_trace(get_histogram_graph_obj(np_histogram), row=1, col=1)
-    for bar_obj in get_histogram_gene_bar_obj_list():
-        ret.add_trace(bar_obj, row=2, col=1)
     ret.update_layout(
         margin={"t": 0, "b": 0, "l": 0, "r": 0, "pad": 0},
         plot_bgcolor="white",
@@ -145,7 +177,7 @@ def get_histogram_fig(np_histogram):
         yaxis2={"visible": False, "fixedrange": True},
         barmode="overlay"
     )
-
+    ret = ret.to_dict()["layout"]
     return ret
 
 
@@ -157,37 +189,41 @@ def get_histogram_graph_obj(np_histogram):
     :param np_histogram: Numpy histogram object used to produce bars in
         histogram view.
     :type np_histogram: tuple
-    :return: Plotly graph object representing main plot with bars in
+    :return: Plotly bar trace representing main plot with bars in
         histogram view.
-    :rtype: go.Bar
+    :rtype: dict
     """
     [counts, bins] = np_histogram
     bin_medians = 0.5 * (bins[:-1] + bins[1:])
-    bin_ranges = np.column_stack((bins[:-1], bins[1:]))
+    # Formatting Python ints is much faster than formatting numpy
+    # scalars one at a time.
+    bin_starts = bins[:-1].tolist()
+    bin_ends = bins[1:].tolist()
     hover_template = \
         "%{y} mutations across positions %{customdata}<extra></extra>"
     # We use the ``Bar`` function instead of ``Histogram`` because we
     # are using the numpy histogram function instead of the one
     # provided by Plotly.
-    ret = go.Bar(
-        x=bin_medians,
-        y=counts,
-        marker={"color": "black"},
-        showlegend=False,
-        customdata=["%s to %s" % (x[0], x[1]) for x in bin_ranges],
-        hovertemplate=hover_template
-    )
+    ret = {
+        "type": "bar",
+        "x": bin_medians.tolist(),
+        "y": counts.tolist(),
+        "marker": {"color": "black"},
+        "showlegend": False,
+        "customdata": ["%s to %s" % x for x in zip(bin_starts, bin_ends)],
+        "hovertemplate": hover_template
+    }
     return ret
 
 
 def get_np_histogram(data):
     """Get histogram data structure for histogram view.
 
-    We use the histogram function from numpy instead of the histogram
-    function of Plotly because it provides details on the histogram
-    after it is generated here in the server-side code. Plotly generates
-    histograms on the fly in the browser, which provides no data for
-    generating a mock axis.
+    We bin the data with numpy instead of the histogram function of
+    Plotly because it provides details on the histogram after it is
+    generated here in the server-side code. Plotly generates histograms
+    on the fly in the browser, which provides no data for generating a
+    mock axis. The return value has the same shape as ``np.histogram``.
 
     :param data: ``data_parser.get_data`` return value
     :type data: dict
@@ -195,55 +231,70 @@ def get_np_histogram(data):
         view.
     :rtype: tuple
     """
-    np_input = [int(x) for x in data["histogram_x"]]
-    np_last_bin = int(math.ceil(max(np_input) / 100)) * 100
-    ret = np.histogram(np_input, bins=range(0, np_last_bin+1, 100))
+    np_input = np.asarray(data["histogram_x"], dtype=np.int64)
+    # Round the max position up to the nearest 100 with integer math
+    np_last_bin = (int(np_input.max()) + 99) // 100 * 100
+    bin_count = np_last_bin // 100
+    # The bins are all 100 wide, so we can index them directly and
+    # count with ``np.bincount``, which is faster than ``np.histogram``.
+    # Like ``np.histogram``, the last bin also includes its right edge.
+    bin_indices = np.minimum(np_input // 100, bin_count - 1)
+    counts = np.bincount(bin_indices, minlength=bin_count)
+    bins = np.arange(0, np_last_bin + 1, 100)
+    ret = (counts, bins)
     return ret
 
 
+@lru_cache(maxsize=None)
 def get_histogram_gene_bar_obj_list():
     """Get Plotly graph object list representing histogram gene bar.
 
     We return a list so they can be overlayed on top of each other in
-    ``get_histogram_fig``.
+    ``get_histogram_fig``. The bars only depend on module-level
+    constants, so they are built once and cached. The list is returned
+    as a tuple so the cached value cannot be mutated by callers, who
+    should copy a bar before changing it.
 
     :param data: ``data_parser.get_data`` return value
     :type data: dict
-    :return: List of plotly graph objects representing gene bar in
+    :return: List of Plotly bar traces representing gene bar in
         histogram view.
-    :rtype: list[go.Bar]
+    :rtype: tuple[dict]
     """
-    ret = [go.Bar(name="",
-                  x=[GENOME_LEN],
-                  y=["foo"],
-                  base=1,
-                  orientation="h",
-                  marker={
-                      "color": GENE_COLORS_DICT["INTERGENIC"],
-                      "line": {"width": 0}
-                  },
-                  showlegend=False,
-                  hoverinfo="skip")]
+    ret = [{"type": "bar",
+            "name": "",
+            "x": [GENOME_LEN],
+            "y": ["foo"],
+            "base": 1,
+            "orientation": "h",
+            "marker": {
+                "color": GENE_COLORS_DICT["INTERGENIC"],
+                "line": {"width": 0}
+            },
+            "showlegend": False,
+            "hoverinfo": "skip"}]
     for gene in GENE_POSITIONS_DICT:
         gene_start = GENE_POSITIONS_DICT[gene]["start"]
         gene_end = GENE_POSITIONS_DICT[gene]["end"]
         gene_bar_len = gene_end - gene_start
         gene_bar_text = [gene] if gene_bar_len > 1000 else []
-        gene_bar_obj = go.Bar(name=gene,
-                              x=[gene_bar_len],
-                              y=["foo"],
-                              base=gene_start,
-                              orientation="h",
-                              text=gene_bar_text,
-                              textposition="inside",
-                              insidetextanchor="middle",
-                              insidetextfont={"color": "white"},
-                              marker={
-                                  "color": GENE_COLORS_DICT[gene],
-                                  "line": {"width": 0}
-                              },
-                              showlegend=False,
-                              hovertemplate=gene,
-                              customdata=[gene_start])
+        gene_bar_obj = {"type": "bar",
+                        "name": gene,
+                        "x": [gene_bar_len],
+                        "y": ["foo"],
+                        "base": gene_start,
+                        "orientation": "h",
+                        "text": gene_bar_text,
+                        "textposition": "inside",
+                        "insidetextanchor": "middle",
+                        "insidetextfont": {"color": "white"},
+                        "marker": {
+                            "color": GENE_COLORS_DICT[gene],
+                            "line": {"width": 0}
+                        },
+                        "showlegend": False,
+                        "hovertemplate": gene,
+                        "customdata": [gene_start]}
         ret.append(gene_bar_obj)
+    ret = tuple(ret)
     return ret
@@ -1,10 +1,36 @@
 """Functions for generating legend view."""
 
+from functools import lru_cache
+
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import dash_html_components as html
 import plotly.graph_objects as go
 
+# Layout shared by the small Plotly figs in the legend. Figs that need
+# a different axis range override the axis with a copy.
+LEGEND_FIG_LAYOUT = {
+    "height": 75,
+    "font": {"size": 16},
+    "margin": {
+        "l": 0,
+        "r": 0,
+        "t": 0,
+        "b": 0,
+        "pad": 0
+    },
+    "plot_bgcolor": "white",
+    "xaxis": {
+        "visible": False,
+        "fixedrange": True
+    },
+    "yaxis": {
+        "visible": False,
+        "fixedrange": True,
+        "range": [-1, 2]
+    }
+}
+
 
 def get_legend_collapse():
     """Get Dash Bootstrap Components collapse containing legend row.
@@ -140,34 +166,20 @@ def get_axes_description():
     return ret
 
 
+@lru_cache(maxsize=None)
 def get_single_genome_legend_fig():
     """Get Plotly figure used as single genome legend.
 
+    The fig is only built once. Do not mutate it.
+
     :return: Plotly figure containing single genome legend
-    :rtype: go.Figure
+    :rtype: dict
     """
-    ret = go.Figure(get_single_genome_legend_graph_obj())
-    ret.update_layout(
-        height=75,
-        font={"size": 16},
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 0,
-            "pad": 0
-        },
-        plot_bgcolor="white",
-        xaxis={
-            "visible": False,
-            "fixedrange": True
-        },
-        yaxis={
-            "visible": False,
-            "fixedrange": True,
-            "range": [-1, 2]
-        }
-    )
+    ret = go.Figure(layout=LEGEND_FIG_LAYOUT)
+    # The trace is a dict, which Plotly does not validate, so we add
+    # it to the validated layout as a dict too.
+    ret = ret.to_dict()
+    ret["data"] = [get_single_genome_legend_graph_obj()]
     return ret
 
 
@@ -176,132 +188,111 @@ def get_single_genome_legend_graph_obj():
 
     This is really just a scatterplot with a single point.
 
-    :return: Plotly scatterplot obj containing single genome legend
-    :rtype: go.Scatter
+    :return: Plotly scatter trace containing single genome legend
+    :rtype: dict
     """
-    ret = go.Scatter(
-        x=[0],
-        y=[0],
-        mode="markers+text",
-        marker={
+    ret = {
+        "type": "scatter",
+        "x": [0],
+        "y": [0],
+        "mode": "markers+text",
+        "marker": {
             "color": "#ffffff",
             "symbol": "square",
             "line": {"width": 2},
             "size": 30
         },
-        text=["N==1"],
-        textposition="top center",
-        hoverinfo="skip"
-    )
+        "text": ["N==1"],
+        "textposition": "top center",
+        "hoverinfo": "skip"
+    }
     return ret
 
 
+@lru_cache(maxsize=None)
 def get_indel_legend_fig():
     """Get Plotly figure used as indel legend.
 
+    The fig is only built once. Do not mutate it.
+
     :return: Plotly figure containing indel legend
-    :rtype: go.Figure
+    :rtype: dict
     """
-    ret = go.Figure(get_indel_legend_graph_obj())
-    ret.update_layout(
-        height=75,
-        font={"size": 16},
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 0,
-            "pad": 0
-        },
-        plot_bgcolor="white",
-        xaxis={
-            "visible": False,
-            "fixedrange": True,
-            "range": [-1, 2]
-        },
-        yaxis={
-            "visible": False,
-            "fixedrange": True,
-            "range": [-1, 2]
+    ret = go.Figure(
+        layout={
+            **LEGEND_FIG_LAYOUT,
+            "xaxis": {**LEGEND_FIG_LAYOUT["xaxis"], "range": [-1, 2]}
         }
     )
+    # The trace is a dict, which Plotly does not validate, so we add
+    # it to the validated layout as a dict too.
+    ret = ret.to_dict()
+    ret["data"] = [get_indel_legend_graph_obj()]
     return ret
 
 
 def get_indel_legend_graph_obj():
     """Get Plotly graph obj used as indel legend.
 
-    :return: Plotly scatterplot obj containing single genome legend
-    :rtype: go.Scatter
+    :return: Plotly scatter trace containing single genome legend
+    :rtype: dict
     """
-    ret = go.Scatter(
-        x=[0, 1, 0, 1],
-        y=[0, 0, 0, 0],
-        mode="markers+text",
-        marker={
+    ret = {
+        "type": "scatter",
+        "x": [0, 1, 0, 1],
+        "y": [0, 0, 0, 0],
+        "mode": "markers+text",
+        "marker": {
             "color": ["#ffffbf", "#ffffbf", "lime", "red"],
             "symbol": ["square", "square", "cross", "x"],
             "line": {"width": 2, "color": "black"},
             "size": [30, 30, 12, 12]
         },
-        text=["Ins", "Del", "", ""],
-        textposition="top center",
-        hoverinfo="skip"
-    )
+        "text": ["Ins", "Del", "", ""],
+        "textposition": "top center",
+        "hoverinfo": "skip"
+    }
     return ret
 
 
+@lru_cache(maxsize=None)
 def get_recorded_functions_legend_fig():
     """Get Plotly figure used as recorded functions legend.
 
     i.e., whether a mutation has recorded functions
 
+    The fig is only built once. Do not mutate it.
+
     :return: Plotly figure containing indel legend
-    :rtype: go.Figure
+    :rtype: dict
     """
-    ret = go.Figure(get_recorded_functions_legend_graph_obj())
-    ret.update_layout(
-        height=75,
-        font={"size": 16},
-        margin={
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "b": 0,
-            "pad": 0
-        },
-        plot_bgcolor="white",
-        xaxis={
-            "visible": False,
-            "fixedrange": True
-        },
-        yaxis={
-            "visible": False,
-            "fixedrange": True,
-            "range": [-1, 2]
-        }
-    )
+    ret = go.Figure(layout=LEGEND_FIG_LAYOUT)
+    # The trace is a dict, which Plotly does not validate, so we add
+    # it to the validated layout as a dict too.
+    ret = ret.to_dict()
+    ret["data"] = [get_recorded_functions_legend_graph_obj()]
     return ret
 
 
 def get_recorded_functions_legend_graph_obj():
     """Get Plotly graph obj used as recorded functions legend.
 
-    :return: Plotly scatterplot obj containing single genome legend
-    :rtype: go.Scatter
+    :return: Plotly scatter trace containing single genome legend
+    :rtype: dict
     """
-    ret = go.Scatter(
-        x=[0],
-        y=[0],
-        mode="markers+text",
-        marker={
+    ret = {
+        "type": "scatter",
+        "x": [0],
+        "y": [0],
+        "mode": "markers+text",
+        "marker": {
             "color": "#ffffbf",
             "symbol": "square",
             "line": {"width": 4},
             "size": 30
         },
-        text=["Functions"],
-        textposition="top center",
-        hoverinfo="skip"
-    )
+        "text": ["Functions"],
+        "textposition": "top center",
+        "hoverinfo": "skip"
+    }
     return ret
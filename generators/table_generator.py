@@ -4,6 +4,19 @@ import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import plotly.graph_objects as go
 
+# Header of the table trace. It is the same for every strain, so it is
+# only built once.
+# TODO these should be determined automatically based on data
+TABLE_HEADER = {
+    "values": ["<b>%s</b>" % e for e in [
+        "pos", "mutation_name", "ref", "alt", "alt_freq", "functions"
+    ]],
+    "line": {"color": "black"},
+    "fill": {"color": "white"},
+    "height": 32,
+    "font": {"size": 16}
+}
+
 
 def get_table_row_div(data):
     """Get Dash Bootstrap Components row containing table view.
@@ -33,14 +46,18 @@ def get_table_fig(data, strain):
     :param strain: Strain to show table for
     :type strain: str
     :return: Plotly figure
-    :rtype: go.Figure
+    :rtype: dict
     """
-    table_obj = get_table_obj(data, strain)
-    ret = go.Figure(table_obj)
-    ret.update_layout(title={
-        "text": strain,
-        "font": {"size": 16}
+    ret = go.Figure(layout={
+        "title": {
+            "text": strain,
+            "font": {"size": 16}
+        }
     })
+    # The table trace is a dict, which Plotly does not validate, so we
+    # add it to the validated layout as a dict too.
+    ret = ret.to_dict()
+    ret["data"] = [get_table_obj(data, strain)]
     return ret
 
 
@@ -51,27 +68,18 @@ def get_table_obj(data, strain):
     :type data: dict
     :param strain: Strain to show table for
     :type strain: str
-    :return: Plotly graph object
-    :rtype: go.Figure
+    :return: Plotly table trace
+    :rtype: dict
     """
-    # TODO these should be determined automatically based on data
-    header_vals = [
-        "pos", "mutation_name", "ref", "alt", "alt_freq", "functions"
-    ]
-    ret = go.Table(
-        header={
-            "values": ["<b>%s</b>" % e for e in header_vals],
-            "line_color": "black",
-            "fill_color": "white",
-            "height": 32,
-            "font": {"size": 16}
-        },
-        cells={
+    ret = {
+        "type": "table",
+        "header": TABLE_HEADER,
+        "cells": {
             "values": data["tables"][strain],
-            "line_color": "black",
-            "fill_color": "white",
+            "line": {"color": "black"},
+            "fill": {"color": "white"},
             "height": 32,
             "font": {"size": 16}
         }
-    )
+    }
     return ret
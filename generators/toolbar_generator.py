@@ -118,6 +118,9 @@ def get_select_lineages_modal_body(data):
         selecting or deselecting all checkboxes.
     :rtype: list
     """
+    # ``data`` must stay JSON serializable, so hidden strains are stored
+    # as a list. We use a set for the membership checks below.
+    hidden_strains_set = set(data["hidden_strains"])
     modal_body = []
     for dir_ in reversed(data["dir_strains_dict"]):
         title = dbc.Row(dbc.Col(os.path.basename(dir_)))
@@ -141,7 +144,7 @@ def get_select_lineages_modal_body(data):
 
         checkboxes = []
         for strain in data["dir_strains_dict"][dir_]:
-            checked = strain not in data["hidden_strains"]
+            checked = strain not in hidden_strains_set
             checkbox = dbc.Checkbox(
                 id={"type": "select-lineages-modal-checkbox", "index": strain},
                 # Kinda lame classname, but makes it faster to extract
@@ -329,8 +332,6 @@ def get_mutation_freq_slider(data):
     :rtype: dcc.RangeSlider
     """
     marks = {}
-    min_val = 1
-    max_val = 0
     for str_val in data["mutation_freq_slider_vals"]:
         # Dash sliders currently have a bug that prevents typing whole
         # numbers as floats. See https://bit.ly/3wgwh9p.
@@ -338,14 +339,15 @@ def get_mutation_freq_slider(data):
         if num_val % 1 == 0:
             num_val = int(num_val)
 
-        if num_val <= min_val:
-            min_val = num_val
-        if num_val >= max_val:
-            max_val = num_val
         marks[num_val] = {
             "label": str_val,
             "style": {"display": "none"}
         }
+    # The slider vals are sorted from lowest to highest, and dicts keep
+    # insertion order, so the first and last marks are the min and max.
+    mark_vals = list(marks)
+    min_val = mark_vals[0]
+    max_val = mark_vals[-1]
     marks[min_val]["label"] = "Freq=" + marks[min_val]["label"]
     if len(marks) > 1:
         marks[min_val]["style"].pop("display")